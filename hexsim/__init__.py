@@ -0,0 +1,8 @@
+"""
+Shared simulation toolkit for the bouncing-ball-in-a-hexagon scripts.
+
+The model scripts in the top-level folders are kept as the LLMs wrote them;
+this package holds the pieces used to run many balls, many hexagons and
+headless evaluations on top of them. Units follow the Claude/Grok scripts:
+distances in pixels, time in frames.
+"""
@@ -0,0 +1,204 @@
+import argparse
+import gc
+import linecache
+import os
+import signal
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from hexsim.headless import FRAMES, make_parser, report, run_headless, run_script
+from hexsim.scripts import REPO_ROOT, resolve, script_paths
+
+# ----- Configuration Constants -----
+SNAPSHOT_INTERVAL = 0.005        # CPU seconds between mid-frame snapshots
+TOP_LINES = 5
+
+
+class AllocationTracker:
+    """
+    Per-frame allocation pressure of a running script.
+
+    tracemalloc only keeps blocks that are still alive, and the temporaries
+    these kernels churn through (Vector2 results, small np.arrays) die
+    within the frame. So the tracker measures them three ways:
+
+    - transient bytes: the traced peak within a frame above the memory in
+      use when the frame started (tracemalloc.reset_peak per frame);
+    - garbage collections per generation and the time spent in them,
+      from gc.callbacks;
+    - by source line, per frame: a snapshot filtered to the script's file
+      at the end of every frame, compared with the previous one
+      (Snapshot.compare_to by line). The count and size differences are
+      summed and divided by the frame count: the blocks and bytes each
+      line leaves alive per frame, which is what leaks or grows caches;
+    - by source line, mid-frame: snapshots taken at random moments in the
+      middle of frames (a SIGPROF timer). A line's mean live blocks over
+      those samples is not a count of allocations, but it grows with how
+      much the line allocates and how long the results live, so it is
+      where the per-frame temporaries show up.
+
+    Call `frame` once per frame (run_headless's on_frame does). Tracing
+    starts at the end of the first frame, once the script's imports and
+    setup are done, so snapshots only hold what the loop allocated.
+    """
+
+    def __init__(self, source, interval=SNAPSHOT_INTERVAL):
+        self.source = source
+        self.interval = interval
+        self.frames = 0
+        self.transient = 0
+        self.retained = 0
+        self.collections = [0, 0, 0]
+        self.gc_seconds = 0.0
+        self.snapshots = 0
+        self.line_blocks = Counter()
+        self.line_bytes = Counter()
+        self.line_count_diff = Counter()
+        self.line_size_diff = Counter()
+        self._frame_snapshot = None
+        self._gc_start = None
+        self._tracing = False
+        self._busy = False
+        self._previous = None
+        self._frame_start = 0
+        self._first = 0
+        self._filters = [tracemalloc.Filter(True, source)]
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.gc_seconds += time.perf_counter() - self._gc_start
+            self.collections[info["generation"]] += 1
+            self._gc_start = None
+
+    def _snapshot(self, signum, frame):
+        if self._busy:
+            return
+        self._busy = True
+        try:
+            snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        finally:
+            self._busy = False
+        for stat in snapshot.statistics("lineno"):
+            line = stat.traceback[0].lineno
+            self.line_blocks[line] += stat.count
+            self.line_bytes[line] += stat.size
+        self.snapshots += 1
+
+    def _compare_frame(self):
+        """Add this frame's per-line differences from the last frame's end."""
+        self._busy = True
+        try:
+            snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        finally:
+            self._busy = False
+        if self._frame_snapshot is not None:
+            for stat in snapshot.compare_to(self._frame_snapshot, "lineno"):
+                line = stat.traceback[0].lineno
+                self.line_count_diff[line] += stat.count_diff
+                self.line_size_diff[line] += stat.size_diff
+        self._frame_snapshot = snapshot
+
+    def _start_tracing(self):
+        tracemalloc.start(1)
+        gc.callbacks.append(self._on_gc)
+        self._first = tracemalloc.get_traced_memory()[0]
+        self._compare_frame()
+        self._frame_start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        self._previous = signal.signal(signal.SIGPROF, self._snapshot)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self._tracing = True
+
+    def stop(self):
+        if not self._tracing:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous or signal.SIG_DFL)
+        gc.callbacks.remove(self._on_gc)
+        self._frame_snapshot = None
+        self.retained = tracemalloc.get_traced_memory()[0] - self._first
+        tracemalloc.stop()
+        self._tracing = False
+
+    def frame(self, count=None):
+        if not self._tracing:
+            self._start_tracing()
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        self.transient += peak - self._frame_start
+        self.frames += 1
+        # The snapshots themselves are traced: start the next frame after
+        self._compare_frame()
+        self._frame_start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def summary(self):
+        frames = max(self.frames, 1)
+        samples = max(self.snapshots, 1)
+        growing = sorted(self.line_size_diff, key=lambda line: -abs(self.line_size_diff[line]))
+        lines = [(line, self.line_count_diff[line] / frames, self.line_size_diff[line] / frames,
+                  linecache.getline(self.source, line).strip())
+                 for line in growing[:TOP_LINES] if self.line_size_diff[line]]
+        live = [(line, self.line_blocks[line] / samples, self.line_bytes[line] / samples,
+                 linecache.getline(self.source, line).strip())
+                for line, _ in self.line_blocks.most_common(TOP_LINES)]
+        return {"frames": self.frames,
+                "transient_bytes_per_frame": self.transient / frames,
+                "retained_bytes": self.retained,
+                "collections_per_frame": [n / frames for n in self.collections],
+                "gc_ms_per_frame": self.gc_seconds * 1000 / frames,
+                "snapshots": self.snapshots,
+                "lines": lines,
+                "live_lines": live}
+
+
+def track_script(path, frames=FRAMES, seed=0):
+    """Run one script headless under an AllocationTracker; returns the result."""
+    path = resolve(path)
+    tracker = AllocationTracker(path)
+    try:
+        result = run_headless(path, frames, seed, on_frame=tracker.frame)
+    finally:
+        tracker.stop()
+    result.update(tracker.summary())
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Report per-frame allocations of model scripts, by source line.")
+    parser.add_argument("scripts", nargs="*", help="default: every model script")
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    for path in args.scripts or script_paths():
+        result = run_script(path, args.frames, args.seed, module="hexsim.allocations",
+                            extra_args=("--child",))
+        name = os.path.relpath(resolve(path), REPO_ROOT)
+        if "lines" not in result:
+            print("%s: %s %s\n" % (name, result["status"], result["error"] or ""))
+            continue
+        gen = result["collections_per_frame"]
+        print("%s: %s, %.1f KB transient/frame, gc %.2f/%.3f/%.4f per frame (%.3f ms)"
+              % (name, result["status"], result["transient_bytes_per_frame"] / 1024,
+                 gen[0], gen[1], gen[2], result["gc_ms_per_frame"]))
+        print("  left alive per frame:")
+        for line, blocks, size, text in result["lines"]:
+            print("  line %4d  %+8.2f blocks  %+9.1f B  %s" % (line, blocks, size, text[:60]))
+        print("  mean live mid-frame:")
+        for line, blocks, size, text in result["live_lines"]:
+            print("  line %4d  %8.1f blocks  %9.0f B  %s" % (line, blocks, size, text[:60]))
+        print()
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        sys.argv.remove("--child")
+        args = make_parser("Track one model script's allocations headless.").parse_args()
+        report(track_script(args.script, args.frames, args.seed))
+    else:
+        main()
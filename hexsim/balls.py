@@ -0,0 +1,265 @@
+import numpy as np
+
+# ----- Configuration Constants -----
+INITIAL_CAPACITY = 64            # Rows allocated by an empty BallSet
+DEFAULT_RADIUS = 15
+DEFAULT_COLOR = (255, 0, 0)
+
+# Column names, in storage order. Every column is a contiguous float64 array,
+# except `color` which packs 0xRRGGBB into a uint32 (44 bytes per ball).
+FLOAT_COLUMNS = ("x", "y", "vx", "vy", "radius")
+
+
+def pack_color(color):
+    """Pack an (r, g, b) tuple into a single 0xRRGGBB integer."""
+    r, g, b = color[:3]
+    return (int(r) << 16) | (int(g) << 8) | int(b)
+
+
+def unpack_color(value):
+    """Unpack a 0xRRGGBB integer into an (r, g, b) tuple."""
+    value = int(value)
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
+
+class BallView:
+    """
+    A lightweight handle on one row of a BallSet.
+
+    It exposes the same attributes as the per-script `Ball` classes
+    (x, y, vx, vy, radius, color) so existing drawing and collision code can
+    keep using attribute access, while the data stays in the set's columns.
+    """
+    __slots__ = ("_set", "index")
+
+    def __init__(self, ball_set, index):
+        self._set = ball_set
+        self.index = index
+
+    def _get(name):
+        def getter(self):
+            return float(getattr(self._set, "_" + name)[self.index])
+
+        def setter(self, value):
+            getattr(self._set, "_" + name)[self.index] = value
+
+        return property(getter, setter)
+
+    x = _get("x")
+    y = _get("y")
+    vx = _get("vx")
+    vy = _get("vy")
+    radius = _get("radius")
+    del _get
+
+    @property
+    def color(self):
+        return unpack_color(self._set._color[self.index])
+
+    @color.setter
+    def color(self, value):
+        self._set._color[self.index] = pack_color(value)
+
+    def __repr__(self):
+        return "BallView(index=%d, x=%.2f, y=%.2f, vx=%.2f, vy=%.2f)" % (
+            self.index, self.x, self.y, self.vx, self.vy)
+
+
+class BallSet:
+    """
+    Structure-of-arrays container holding every ball of a simulation.
+
+    Each attribute lives in its own contiguous NumPy column, so vectorized
+    kernels can work on `balls.x`, `balls.vy`, ... directly. The column
+    properties return views of the live rows (no copies); writing into them
+    updates the balls. Indexing returns a BallView for code that wants to
+    handle one ball at a time.
+
+    `generation` goes up whenever balls are added or removed, so code that
+    caches per-ball data can tell when its rows no longer line up.
+    """
+    # False for sets bound to memory they must not leave (from_columns)
+    growable = True
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self._count = 0
+        self.generation = 0
+        self._allocate(max(1, int(capacity)))
+
+    @classmethod
+    def from_columns(cls, x, y, vx, vy, radius, color=None, count=None,
+                     growable=True):
+        """
+        Wrap existing float64 arrays as a BallSet without copying. Used for
+        views into shared memory and for per-worker subsets. The first
+        `count` rows are live (all of them by default); the rest is room
+        to add balls in. Past that, the set moves into arrays of its own,
+        or raises ValueError if `growable` is False.
+        """
+        self = cls.__new__(cls)
+        self._x, self._y, self._vx, self._vy = x, y, vx, vy
+        self._radius = radius
+        if color is None:
+            color = np.full(len(x), pack_color(DEFAULT_COLOR), dtype=np.uint32)
+        self._color = color
+        self._capacity = len(x)
+        self._count = self._capacity if count is None else int(count)
+        self.generation = 0
+        self.growable = growable
+        return self
+
+    def _allocate(self, capacity):
+        if not self.growable:
+            raise ValueError("ball set is bound to %d rows and cannot grow"
+                             % self._capacity)
+        old_count = self._count
+        for name in FLOAT_COLUMNS:
+            column = np.zeros(capacity, dtype=np.float64)
+            if old_count:
+                column[:old_count] = getattr(self, "_" + name)[:old_count]
+            setattr(self, "_" + name, column)
+        color = np.zeros(capacity, dtype=np.uint32)
+        if old_count:
+            color[:old_count] = self._color[:old_count]
+        self._color = color
+        self._capacity = capacity
+
+    def reserve(self, capacity):
+        """Make sure at least `capacity` rows are allocated."""
+        if capacity > self._capacity:
+            self._allocate(capacity)
+
+    # ----- Construction -----
+
+    def add(self, x, y, vx=0.0, vy=0.0, radius=DEFAULT_RADIUS,
+            color=DEFAULT_COLOR):
+        """Append one ball and return its BallView."""
+        if self._count == self._capacity:
+            # Sets wrapped around empty columns start from nothing
+            self._allocate(max(INITIAL_CAPACITY, self._capacity * 2))
+        i = self._count
+        self._x[i] = x
+        self._y[i] = y
+        self._vx[i] = vx
+        self._vy[i] = vy
+        self._radius[i] = radius
+        self._color[i] = pack_color(color)
+        self._count += 1
+        self.generation += 1
+        return BallView(self, i)
+
+    def extend(self, x, y, vx=0.0, vy=0.0, radius=DEFAULT_RADIUS,
+               color=DEFAULT_COLOR):
+        """
+        Append many balls at once. Every argument may be a scalar or an
+        array of the same length as `x`.
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        n = len(x)
+        start = self._count
+        self.reserve(start + n)
+        stop = start + n
+        self._x[start:stop] = x
+        self._y[start:stop] = y
+        self._vx[start:stop] = vx
+        self._vy[start:stop] = vy
+        self._radius[start:stop] = radius
+        if isinstance(color, tuple):
+            self._color[start:stop] = pack_color(color)
+        else:
+            self._color[start:stop] = color
+        self._count = stop
+        self.generation += 1
+        return range(start, stop)
+
+    def remove(self, index):
+        """
+        Remove one ball by moving the last row into its slot.
+        Indices of other balls stay valid except for the last one.
+        """
+        last = self._count - 1
+        if not 0 <= index <= last:
+            raise IndexError("ball index out of range")
+        if index != last:
+            for name in FLOAT_COLUMNS + ("color",):
+                column = getattr(self, "_" + name)
+                column[index] = column[last]
+        self._count = last
+        self.generation += 1
+
+    def clear(self):
+        self._count = 0
+        self.generation += 1
+
+    # ----- Columns (live views) -----
+
+    @property
+    def x(self):
+        return self._x[:self._count]
+
+    @property
+    def y(self):
+        return self._y[:self._count]
+
+    @property
+    def vx(self):
+        return self._vx[:self._count]
+
+    @property
+    def vy(self):
+        return self._vy[:self._count]
+
+    @property
+    def radius(self):
+        return self._radius[:self._count]
+
+    @property
+    def color(self):
+        return self._color[:self._count]
+
+    # ----- Sequence protocol -----
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("ball index out of range")
+        return BallView(self, index)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield BallView(self, i)
+
+    @property
+    def nbytes(self):
+        """Bytes of column storage per allocated row, times rows allocated."""
+        return sum(getattr(self, "_" + name).nbytes
+                   for name in FLOAT_COLUMNS + ("color",))
+
+    # ----- Physics -----
+
+    def update(self, gravity, friction, index=None):
+        """
+        Advance every ball by one frame, in the same order as `Ball.update`
+        in the Claude 3.7 scripts: gravity, move, then air friction. With
+        `index`, only those balls move.
+        """
+        n = self._count
+        if index is not None:
+            vx = self._vx[index] * friction
+            vy = self._vy[index] + gravity
+            self._x[index] += self._vx[index]
+            self._y[index] += vy
+            self._vx[index] = vx
+            self._vy[index] = vy * friction
+            return
+        vx = self._vx[:n]
+        vy = self._vy[:n]
+        vy += gravity
+        self._x[:n] += vx
+        self._y[:n] += vy
+        vx *= friction
+        vy *= friction
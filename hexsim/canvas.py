@@ -0,0 +1,130 @@
+import time
+
+import pygame
+
+from hexsim.balls import BallSet
+from hexsim.render import SpriteRenderer
+
+# ----- Configuration Constants -----
+WIDTH, HEIGHT = 800, 600         # The scripts' window, i.e. world units
+SCALE = 0.25                     # Canvas pixels per world unit
+BACKGROUND = (0, 0, 0)
+HEXAGON_COLOR = (0, 0, 255)
+HEXAGON_WIDTH = 2                # In world units, like the scripts' line widths
+
+
+class ScaledCanvas:
+    """
+    Draws one simulation at an internal resolution of its own.
+
+    Physics stays in world units (the scripts' WIDTH x HEIGHT pixels);
+    everything drawn goes through `scale` onto a canvas of
+    round(WIDTH * scale) x round(HEIGHT * scale) pixels, so drawing costs
+    what the output needs rather than a full 800x600 frame that is then
+    shrunk. Radii and line widths scale too (balls under 2 canvas pixels
+    across become points, see SpriteRenderer).
+
+    `present` puts the canvas into a rectangle of the screen with a single
+    resampling straight into that part of the screen: a plain blit when
+    the sizes match, transform.scale2x for an exact doubling, otherwise
+    transform.scale.
+    """
+
+    def __init__(self, scale=SCALE, world_size=(WIDTH, HEIGHT)):
+        self.scale = scale
+        self.world_size = world_size
+        self.size = (max(1, round(world_size[0] * scale)), max(1, round(world_size[1] * scale)))
+        self.surface = pygame.Surface(self.size)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self.renderer = SpriteRenderer()
+        self._targets = {}
+
+    def fill(self, color=BACKGROUND):
+        self.surface.fill(color)
+
+    def polygon(self, color, points, width=0):
+        s = self.scale
+        scaled = [(x * s, y * s) for x, y in points]
+        pygame.draw.polygon(self.surface, color, scaled, max(1, round(width * s)) if width else 0)
+
+    def circle(self, color, center, radius):
+        s = self.scale
+        pygame.draw.circle(self.surface, color, (int(center[0] * s), int(center[1] * s)),
+                           max(1, round(radius * s)))
+
+    def draw_balls(self, balls):
+        s = self.scale
+        self.renderer.draw(self.surface, BallSet.from_columns(
+            balls.x * s, balls.y * s, balls.vx, balls.vy, balls.radius * s, balls.color))
+
+    def draw_world(self, world, color=HEXAGON_COLOR, width=HEXAGON_WIDTH):
+        """Background, container outline and balls of a hexsim World."""
+        self.fill()
+        self.polygon(color, world.hexagon.vertex_list(), width)
+        self.draw_balls(world.balls)
+
+    def _target(self, screen, rect):
+        key = (id(screen), tuple(rect))
+        target = self._targets.get(key)
+        if target is None or target.get_parent() is not screen:
+            target = self._targets[key] = screen.subsurface(rect)
+        return target
+
+    def present(self, screen, rect):
+        """Scale the canvas into `rect` of `screen`."""
+        rect = pygame.Rect(rect)
+        width, height = self.size
+        if rect.size == (width, height):
+            screen.blit(self.surface, rect)
+        elif rect.size == (2 * width, 2 * height):
+            pygame.transform.scale2x(self.surface, self._target(screen, rect))
+        else:
+            pygame.transform.scale(self.surface, rect.size, self._target(screen, rect))
+
+
+def tile_rects(count, columns, tile_size):
+    """Screen rectangles of a `columns`-wide grid of `count` tiles."""
+    width, height = tile_size
+    return [pygame.Rect((i % columns) * width, (i // columns) * height, width, height)
+            for i in range(count)]
+
+
+def benchmark(tiles=64, columns=8, tile_size=(200, 150), count=200, frames=20, seed=0):
+    """
+    Render a wall of `tiles` worlds of `count` balls into `tile_size`
+    tiles, three ways: each at full 800x600 then shrunk, on a canvas at
+    tile resolution, and on a half-resolution canvas doubled by scale2x.
+    Returns [(label, seconds per frame)] (rendering only, no physics).
+    """
+    from hexsim.engine import World, fill_hexagon
+
+    pygame.display.init()
+    rects = tile_rects(tiles, columns, tile_size)
+    screen = pygame.display.set_mode((columns * tile_size[0], -(-tiles // columns) * tile_size[1]))
+    worlds = [fill_hexagon(World(ball_radius=3.0, ball_collisions=False), count, seed=seed + i)
+              for i in range(tiles)]
+    for world in worlds:
+        world.step()
+    tile_scale = tile_size[0] / WIDTH
+    layouts = (("full 800x600, then shrunk", 1.0),
+               ("canvas at tile size", tile_scale),
+               ("half-size canvas + scale2x", tile_scale / 2))
+    rows = []
+    for label, scale in layouts:
+        canvases = [ScaledCanvas(scale) for _ in worlds]
+        start = time.perf_counter()
+        for _ in range(frames):
+            for world, canvas, rect in zip(worlds, canvases, rects):
+                canvas.draw_world(world)
+                canvas.present(screen, rect)
+        rows.append((label, (time.perf_counter() - start) / frames))
+    return rows
+
+
+if __name__ == "__main__":
+    import os
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    for label, seconds in benchmark():
+        print("64 tiles of 200 balls, %-28s %6.2f ms per frame" % (label + ":", seconds * 1000))
@@ -0,0 +1,170 @@
+import struct
+
+import numpy as np
+
+# ----- Configuration Constants -----
+CHUNK_ROWS = 65536               # Rows buffered before a flush to disk
+SPEED_BINS = np.linspace(0.0, 20.0, 41)   # Impact-speed histogram edges (px/frame)
+
+# Columns of one impact, in file order
+COLUMNS = (("frame", "<i8"), ("ball", "<i8"), ("edge", "<i4"),
+           ("contact_x", "<f4"), ("contact_y", "<f4"),
+           ("normal_x", "<f4"), ("normal_y", "<f4"),
+           ("speed", "<f4"), ("impulse", "<f4"))
+# File: chunks of (magic, row count) then each column's rows
+CHUNK_MAGIC = b"HXCL"
+CHUNK_HEADER = struct.Struct("<4sI")
+
+
+class CollisionLog:
+    """
+    Column buffers recording every wall impact: frame, ball, edge, world-
+    space contact point and inward normal, normal speed relative to the
+    wall, and impulse (per unit mass). Contacts where the ball was only
+    pushed out, not bounced, are not impacts and are not logged.
+
+    Rows go into preallocated CHUNK_ROWS-long arrays that are written to
+    `path` whenever they fill up (kept in memory when `path` is None).
+    Per-edge counts, impulse sums and impact-speed histograms are kept up
+    to date as rows arrive, so `edge_stats` never reads the log back.
+
+    The kernels fill it when passed as `log`; set `frame` before each
+    step (World does this).
+    """
+
+    def __init__(self, path=None, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.frame = 0
+        self.rows = 0
+        self._fill = 0
+        self._buffers = {name: np.empty(chunk_rows, dtype=dtype) for name, dtype in COLUMNS}
+        self._chunks = []
+        self._file = open(path, "wb") if path is not None else None
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.impulse_sum = np.zeros(0)
+        self.speed_hist = np.zeros((0, len(SPEED_BINS) - 1), dtype=np.int64)
+
+    def append(self, ball, edge, contact_x, contact_y, normal_x, normal_y, speed, impulse):
+        """Log impacts given as equal-length arrays (normals may be scalars)."""
+        ball = np.asarray(ball)
+        n = len(ball)
+        if n == 0:
+            return
+        edge = np.broadcast_to(edge, n)
+        values = (self.frame, ball, edge, contact_x, contact_y,
+                  np.broadcast_to(normal_x, n), np.broadcast_to(normal_y, n), speed, impulse)
+        start = 0
+        while start < n:
+            room = len(self._buffers["frame"]) - self._fill
+            take = min(room, n - start)
+            part = slice(start, start + take)
+            rows = slice(self._fill, self._fill + take)
+            for (name, _), value in zip(COLUMNS, values):
+                self._buffers[name][rows] = value if np.ndim(value) == 0 else value[part]
+            self._fill += take
+            start += take
+            if self._fill == len(self._buffers["frame"]):
+                self.flush()
+        self.rows += n
+        self._update_stats(np.asarray(edge), np.asarray(speed), np.asarray(impulse))
+
+    def _update_stats(self, edge, speed, impulse):
+        edges = int(edge.max()) + 1
+        if edges > len(self.hits):
+            grow = edges - len(self.hits)
+            self.hits = np.concatenate([self.hits, np.zeros(grow, dtype=np.int64)])
+            self.impulse_sum = np.concatenate([self.impulse_sum, np.zeros(grow)])
+            self.speed_hist = np.vstack([self.speed_hist,
+                                         np.zeros((grow, self.speed_hist.shape[1]), dtype=np.int64)])
+        edges = len(self.hits)
+        self.hits += np.bincount(edge, minlength=edges)
+        self.impulse_sum += np.bincount(edge, weights=impulse, minlength=edges)
+        bins = len(SPEED_BINS) - 1
+        b = np.clip(np.searchsorted(SPEED_BINS, speed, side="right") - 1, 0, bins - 1)
+        self.speed_hist += np.bincount(edge * bins + b, minlength=edges * bins).reshape(edges, bins)
+
+    def flush(self):
+        """Write the buffered rows out as one chunk."""
+        n = self._fill
+        if n == 0:
+            return
+        chunk = [CHUNK_HEADER.pack(CHUNK_MAGIC, n)]
+        chunk.extend(self._buffers[name][:n].tobytes() for name, _ in COLUMNS)
+        if self._file is not None:
+            self._file.write(b"".join(chunk))
+        else:
+            self._chunks.append(b"".join(chunk))
+        self._fill = 0
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def edge_stats(self):
+        """
+        Per edge: (hits, mean impulse, speed histogram over SPEED_BINS),
+        as arrays indexed by edge.
+        """
+        mean = np.divide(self.impulse_sum, self.hits,
+                         out=np.zeros(len(self.hits)), where=self.hits > 0)
+        return self.hits.copy(), mean, self.speed_hist.copy()
+
+    def columns(self):
+        """Every row logged so far, read back as {name: array}."""
+        self.flush()
+        if self._file is not None:
+            self._file.flush()
+            return read_log(self.path)
+        return _parse(b"".join(self._chunks))
+
+
+def _parse(data):
+    parts = {name: [] for name, _ in COLUMNS}
+    offset = 0
+    while offset < len(data):
+        magic, n = CHUNK_HEADER.unpack_from(data, offset)
+        if magic != CHUNK_MAGIC:
+            raise ValueError("corrupt collision log at byte %d" % offset)
+        offset += CHUNK_HEADER.size
+        for name, dtype in COLUMNS:
+            parts[name].append(np.frombuffer(data, dtype=dtype, count=n, offset=offset))
+            offset += n * np.dtype(dtype).itemsize
+    return {name: (np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype))
+            for (name, dtype), chunks in zip(COLUMNS, parts.values())}
+
+
+def read_log(path):
+    """Every row of a collision log file as {name: array}."""
+    with open(path, "rb") as f:
+        return _parse(f.read())
+
+
+def demo(count=2000, frames=600, path="collisions.hxcl", seed=0):
+    """Log a gravity world's wall impacts to `path` and return the log."""
+    from hexsim.engine import World, fill_hexagon
+
+    with CollisionLog(path) as log:
+        world = fill_hexagon(World(ball_radius=2.0, log=log), count, seed=seed)
+        for _ in range(frames):
+            world.step()
+    return log
+
+
+if __name__ == "__main__":
+    log = demo()
+    hits, mean_impulse, speeds = log.edge_stats()
+    print("%d impacts logged to %s" % (log.rows, log.path))
+    print("edge   hits  mean impulse  median speed")
+    centers = (SPEED_BINS[:-1] + SPEED_BINS[1:]) / 2
+    for edge in range(len(hits)):
+        cumulative = np.cumsum(speeds[edge])
+        median = centers[np.searchsorted(cumulative, cumulative[-1] / 2)] if hits[edge] else 0.0
+        print("%4d  %6d  %12.3f  %12.2f" % (edge, hits[edge], mean_impulse[edge], median))
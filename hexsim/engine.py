@@ -0,0 +1,124 @@
+import math
+import time
+
+import numpy as np
+
+from hexsim.balls import BallSet
+from hexsim.broadphase import BALL_RESTITUTION, UniformGrid, collide_balls
+from hexsim.hexagon import RESTITUTION, Hexagon
+from hexsim.kernels import collide_container
+
+# ----- Configuration Constants -----
+WIDTH, HEIGHT = 800, 600
+HEX_RADIUS = 300
+BALL_RADIUS = 1.0
+GRAVITY = 0.5                    # Pixels per frame^2
+FRICTION = 0.99                  # Air friction per frame
+
+
+class World:
+    """
+    Many balls inside one spinning hexagon.
+
+    `hexagon` may also be any hexsim.polygon.Container.
+
+    One call to `step` advances the world by one frame: integrate the
+    balls, turn the hexagon, resolve wall contacts, then ball/ball contacts,
+    then the walls once more (unlogged), since the ball solver pushes balls
+    on the rim of a pile back out through the wall. Every ball ends the
+    frame inside the container; see `escaped`.
+    """
+
+    def __init__(self, balls=None, hexagon=None, ball_radius=BALL_RADIUS,
+                 gravity=GRAVITY, friction=FRICTION,
+                 restitution=RESTITUTION, ball_restitution=BALL_RESTITUTION,
+                 ball_collisions=True, iterations=1, contacts=None, log=None):
+        self.balls = balls if balls is not None else BallSet()
+        self.hexagon = hexagon or Hexagon(WIDTH / 2, HEIGHT / 2, HEX_RADIUS)
+        self.gravity = gravity
+        self.friction = friction
+        self.restitution = restitution
+        self.ball_restitution = ball_restitution
+        self.ball_collisions = ball_collisions
+        self.iterations = iterations
+        # Optional hexsim.contact.ContactTracker for resting/sleeping balls
+        self.contacts = contacts
+        # Optional hexsim.collisionlog.CollisionLog of wall impacts
+        self.log = log
+        self.grid = UniformGrid(self.hexagon.center_x, self.hexagon.center_y,
+                                self.hexagon.radius, ball_radius)
+        self.frame = 0
+
+    def step(self):
+        if self.log is not None:
+            self.log.frame = self.frame
+        if self.contacts is not None:
+            self.contacts.step(self)
+            return
+        self.balls.update(self.gravity, self.friction)
+        self.hexagon.update()
+        collide_container(self.balls, self.hexagon, self.restitution, self.log)
+        if self.ball_collisions:
+            # Extra relaxation passes reuse the broadphase pairs; they help
+            # tall resting piles, where support has to travel ball by ball.
+            pairs = self.grid.candidate_pairs(self.balls.x, self.balls.y)
+            for _ in range(self.iterations):
+                collide_balls(self.balls, self.grid, self.ball_restitution,
+                              pairs)
+            collide_container(self.balls, self.hexagon, self.restitution)
+        self.frame += 1
+
+
+def escaped(world, tolerance=1e-6):
+    """
+    Indices of the balls reaching more than `tolerance` pixels past the
+    walls of the world's container (see its `penetration`).
+    """
+    return np.flatnonzero(world.hexagon.penetration(world.balls) > tolerance)
+
+
+def fill_hexagon(world, count, speed=2.0, seed=None, color=(255, 100, 100)):
+    """
+    Scatter `count` balls uniformly inside the container's inscribed circle,
+    with random velocities up to `speed` pixels per frame.
+    """
+    rng = np.random.default_rng(seed)
+    hexagon = world.hexagon
+    inner = hexagon.inradius
+    r = (inner - 2 * world.grid.cell_size) * np.sqrt(rng.random(count))
+    theta = rng.random(count) * 2 * math.pi
+    world.balls.extend(
+        hexagon.center_x + r * np.cos(theta),
+        hexagon.center_y + r * np.sin(theta),
+        rng.uniform(-speed, speed, count),
+        rng.uniform(-speed, speed, count),
+        world.grid.cell_size / 2,
+        color,
+    )
+    return world
+
+
+def benchmark(count=50000, steps=60, seed=0, ball_radius=0.5, gravity=GRAVITY):
+    """
+    Time `steps` frames of a world holding `count` balls, falling into a
+    pile under the scripts' gravity by default, and check after every
+    frame that no ball has left the container. Returns (mean seconds per
+    step, most balls found outside after any one step).
+    """
+    world = fill_hexagon(World(ball_radius=ball_radius, gravity=gravity),
+                         count, seed=seed)
+    world.step()
+    elapsed = 0.0
+    outside = 0
+    for _ in range(steps):
+        start = time.perf_counter()
+        world.step()
+        elapsed += time.perf_counter() - start
+        outside = max(outside, len(escaped(world)))
+    return elapsed / steps, outside
+
+
+if __name__ == "__main__":
+    for n in (1000, 10000, 50000):
+        seconds, outside = benchmark(n)
+        print("%6d balls: %.2f ms/step, %d outside the container" % (n, seconds * 1000, outside))
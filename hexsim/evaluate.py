@@ -0,0 +1,141 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from hexsim.headless import FRAMES, TIMEOUT, run_script
+from hexsim.scripts import REPO_ROOT, resolve, script_paths
+
+# ----- Configuration Constants -----
+RUNNER_VERSION = 1               # Bump when a change alters results: old entries stop matching
+CACHE_DIR = os.path.join(REPO_ROOT, ".hexsim-cache")
+CACHE_BYTES = 16 * 1024 * 1024   # Least recently used entries go beyond this
+# Outcomes that depend only on the inputs; timeouts are not cached
+CACHED_STATUSES = ("ok", "exit", "error")
+
+
+def cache_key(path, params, seed):
+    """SHA-256 over the script's source, the scenario, the seed and RUNNER_VERSION."""
+    with open(path, "rb") as f:
+        source = hashlib.sha256(f.read()).hexdigest()
+    blob = json.dumps({"source": source, "params": params, "seed": seed,
+                       "runner": RUNNER_VERSION}, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Small JSON files named by their key under `directory`. A hit touches
+    the file, so modification times order entries by last use, and `put`
+    evicts the least recently used ones once the total exceeds `max_bytes`.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return result
+
+    def put(self, key, result):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = "%s.tmp%d" % (path, os.getpid())
+        with open(tmp, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) of every entry, least recently used first."""
+        found = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, st.st_size, path))
+        found.sort()
+        return found
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.unlink(path)
+
+
+def evaluate(paths=None, frames=FRAMES, seed=0, cache=None, jobs=None, timeout=TIMEOUT):
+    """
+    Evaluate model scripts headless, answering unchanged ones from
+    `cache` (pass None to always run). Returns one (path, result, cached)
+    tuple per script, in order.
+    """
+    paths = [resolve(p) for p in (paths or script_paths())]
+    params = {"frames": frames}
+    keys = [cache_key(p, params, seed) for p in paths]
+    results = [cache.get(k) if cache is not None else None for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+
+    def work(i):
+        return i, run_script(paths[i], frames, seed, timeout)
+
+    # Each run is its own interpreter, so threads are enough to overlap them
+    with ThreadPoolExecutor(jobs or os.cpu_count() or 1) as pool:
+        for i, result in pool.map(work, missing):
+            results[i] = result
+            # A missing module (pymunk) says more about this machine than
+            # about the script
+            missing_module = (result["error"] or "").startswith("ModuleNotFoundError")
+            if cache is not None and result["status"] in CACHED_STATUSES and not missing_module:
+                cache.put(keys[i], result)
+    fresh = set(missing)
+    return [(p, r, i not in fresh) for i, (p, r) in enumerate(zip(paths, results))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate model scripts headless, with a result cache.")
+    parser.add_argument("scripts", nargs="*", help="default: every model script")
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--clear-cache", action="store_true")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else ResultCache()
+    if args.clear_cache and cache is not None and os.path.isdir(cache.directory):
+        cache.clear()
+    start = time.perf_counter()
+    rows = evaluate(args.scripts, args.frames, args.seed, cache, args.jobs)
+    for path, result, cached in rows:
+        per_frame = ("%7.2f" % (result["seconds"] * 1000 / result["frames"])
+                     if result["frames"] else "      -")
+        print("%-45s %-7s %s ms/frame %s %s" % (
+            os.path.relpath(path, REPO_ROOT), result["status"], per_frame,
+            "cached" if cached else "ran   ", result["error"] or ""))
+    print("%d scripts in %.2f s" % (len(rows), time.perf_counter() - start))
@@ -0,0 +1,577 @@
+import math
+import time
+from collections import namedtuple
+
+# ----- Configuration Constants -----
+GRAVITY = 0.5                    # Pixels per frame^2
+FRICTION = 0.99                  # Per-frame velocity factor, as in World
+RESTITUTION = 0.8
+CONTACT_TOLERANCE = 1e-7         # Gap (px) at which a wall counts as reached
+CLOSING_TOLERANCE = 1e-9         # Slower approaches (px/frame) are grazing, not impacts
+CONTACT_FLIGHT = 1.0             # Rebounds airborne for less than this (frames) stay on the wall
+SLIDE_STEP = 1.0                 # Sampling step for contact events in a spinning container (frames)
+CORNER_ITERATIONS = 60           # Bisection steps locating a contact or crossing
+MAX_ADVANCE_STEPS = 100000       # Root-finding iterations per flight
+FLIGHT_WINDOW = 16.0             # Flight time the first curvature bound covers (frames)
+
+Impact = namedtuple("Impact", "time edge pre_vx pre_vy post_vx post_vy x y")
+
+
+class EventSimulator:
+    """
+    Event-driven simulation of one ball in a spinning convex container.
+
+    Between impacts the ball's flight is closed-form: gravity plus linear
+    air drag, with the drag rate k = -ln(FRICTION) per frame matching the
+    per-frame velocity factor of the stepped engines. Each wall's position
+    is closed-form as well, since the container turns at a constant rate.
+    Instead of polling collisions every frame, `next_impact` finds the
+    first time the ball reaches a wall by conservative advancement (never
+    stepping further than the gap divided by the fastest the gap can
+    close), and `run` jumps from impact to impact.
+
+    A bounce whose rebound would stay in the air for less than
+    CONTACT_FLIGHT frames ends the flight instead: the ball stays on the
+    wall (`contact` holds the edge) and slides along it, closed-form in
+    the container's frame (gravity, drag, centrifugal and Coriolis terms),
+    until it lifts off or reaches the next wall. In a corner it is pinned
+    (`contact` holds both edges) and carried round until the container has
+    turned far enough for one wall to stop holding it. Without that, the
+    bounces of a settling ball shrink geometrically and never end.
+
+    Time is in frames and need not be an integer. `container` is a Hexagon
+    or polygon.Container; only its shape, center, angle and rotation speed
+    are read.
+
+    The cost is per advancement step, not per frame, so this wins when
+    impacts are rare and loses when they are frequent. In a still hexagon
+    an hour of play costs a few milliseconds. In the default spinning one
+    the walls fling the ball into an impact every 7 frames or so, and
+    advancement takes about one step per frame in flight: there it is
+    about a quarter slower than stepping every frame (`benchmark`). Step
+    instead when what is wanted is frames rather than impact times.
+    """
+
+    def __init__(self, container, x, y, vx, vy, radius,
+                 gravity=GRAVITY, friction=FRICTION, restitution=RESTITUTION):
+        polygon = container.polygon
+        self.normals = [tuple(n) for n in polygon.normals.tolist()]
+        self.offsets = polygon.offsets.tolist()
+        self.circumradius = polygon.circumradius
+        self.center_x = container.center_x
+        self.center_y = container.center_y
+        self.angle0 = container.angle
+        self.omega = container.rotation_speed
+        self.radius = radius
+        self.gravity = gravity
+        self.drag = -math.log(friction) if friction < 1 else 0.0
+        self.restitution = restitution
+        # State at time self.t
+        self.t = 0.0
+        self.x, self.y = x, y
+        self.vx, self.vy = vx, vy
+        self.contact = ()
+        self.impacts = 0
+
+    # ----- Closed-form flight -----
+
+    def flight(self, dt):
+        """Position and velocity `dt` frames after the current state."""
+        g, k = self.gravity, self.drag
+        if k == 0:
+            return (self.x + self.vx * dt,
+                    self.y + self.vy * dt + 0.5 * g * dt * dt,
+                    self.vx, self.vy + g * dt)
+        decay = math.exp(-k * dt)
+        settle = g / k                       # terminal fall speed
+        spread = (1.0 - decay) / k
+        return (self.x + self.vx * spread,
+                self.y + settle * dt + (self.vy - settle) * spread,
+                self.vx * decay,
+                settle + (self.vy - settle) * decay)
+
+    def state_at(self, t):
+        """(x, y, vx, vy) at time t >= self.t, assuming no impact between."""
+        return self.flight(t - self.t)
+
+    def _gaps(self, dt):
+        """
+        Wall gaps `dt` frames ahead, as a list of (gap, closing speed) per
+        edge. The closing speed is minus the gap's time derivative.
+        """
+        x, y, vx, vy = self.flight(dt)
+        theta = self.angle0 + self.omega * (self.t + dt)
+        c, s = math.cos(theta), math.sin(theta)
+        dx = x - self.center_x
+        dy = y - self.center_y
+        lx = dx * c + dy * s
+        ly = dy * c - dx * s
+        # Velocity as seen from the spinning local frame
+        rvx = vx * c + vy * s + self.omega * ly
+        rvy = vy * c - vx * s - self.omega * lx
+        radius = self.radius
+        return [(nx * lx + ny * ly - off - radius, -(nx * rvx + ny * rvy))
+                for (nx, ny), off in zip(self.normals, self.offsets)]
+
+    def _speed_bound(self, dt):
+        """Upper bound on the ball's speed over [0, dt]."""
+        if self.drag == 0:
+            return math.hypot(self.vx, abs(self.vy) + self.gravity * dt)
+        # Velocity moves in a straight line from v0 towards terminal
+        # velocity, so it is fastest at one end of the window
+        _, _, vx, vy = self.flight(dt)
+        return max(math.hypot(self.vx, self.vy), math.hypot(vx, vy))
+
+    def _safe_step(self, gaps, curvature):
+        """
+        Longest step no wall can close in, given each gap, its closing
+        speed and a bound on how fast any closing speed can grow.
+        """
+        step = math.inf
+        for gap, closing in gaps:
+            # Smallest positive h with closing * h + curvature * h^2 / 2 = gap
+            root = math.sqrt(closing * closing + 2.0 * curvature * gap)
+            if closing > 0:
+                h = 2.0 * gap / (closing + root)
+            elif curvature > 0:
+                h = (root - closing) / curvature
+            else:
+                continue
+            if h < step:
+                step = h
+        return step
+
+    # ----- The container's frame -----
+
+    def _local(self):
+        """Current position and velocity in the spinning local frame."""
+        theta = self.angle0 + self.omega * self.t
+        c, s = math.cos(theta), math.sin(theta)
+        dx = self.x - self.center_x
+        dy = self.y - self.center_y
+        lx = dx * c + dy * s
+        ly = dy * c - dx * s
+        return (lx, ly, self.vx * c + self.vy * s + self.omega * ly,
+                self.vy * c - self.vx * s - self.omega * lx)
+
+    def _set_local(self, t, lx, ly, rvx, rvy):
+        """Set the state at time t from local position and velocity."""
+        theta = self.angle0 + self.omega * t
+        c, s = math.cos(theta), math.sin(theta)
+        ivx = rvx - self.omega * ly
+        ivy = rvy + self.omega * lx
+        self.t = t
+        self.x = lx * c - ly * s + self.center_x
+        self.y = lx * s + ly * c + self.center_y
+        self.vx = ivx * c - ivy * s
+        self.vy = ivx * s + ivy * c
+
+    def _force(self, theta, lx, ly, rvx, rvy):
+        """
+        Acceleration seen in the local frame at container angle `theta`:
+        gravity and drag (on the inertial velocity), plus the centrifugal
+        and Coriolis terms of the spin.
+        """
+        g, k, w = self.gravity, self.drag, self.omega
+        ivx = rvx - w * ly
+        ivy = rvy + w * lx
+        return (g * math.sin(theta) - k * ivx + w * w * lx + 2.0 * w * rvy,
+                g * math.cos(theta) - k * ivy + w * w * ly - 2.0 * w * rvx)
+
+    def _gap(self, edge, lx, ly):
+        nx, ny = self.normals[edge]
+        return nx * lx + ny * ly - self.offsets[edge] - self.radius
+
+    # ----- Events -----
+
+    def next_impact(self, horizon=math.inf):
+        """
+        Time offset and edge of the next wall contact, or (None, None) if
+        none happens within `horizon` frames.
+        """
+        omega = abs(self.omega)
+        spin = omega * omega * self.circumradius
+        # Bound on d(closing)/dt: acceleration, Coriolis and centripetal
+        # terms of the motion seen from the spinning frame, over the first
+        # `window` frames of the flight. It grows with the window through
+        # the speed, so the window is only widened when a step leaves it,
+        # and steps are accepted only within it.
+        window = FLIGHT_WINDOW
+        speed = self._speed_bound(window)
+        curvature = self.gravity + (self.drag + 2.0 * omega) * speed + spin
+        dt = 0.0
+        for _ in range(MAX_ADVANCE_STEPS):
+            gaps = self._gaps(dt)
+            lying = None
+            step = math.inf
+            for edge, (gap, closing) in enumerate(gaps):
+                if gap <= CONTACT_TOLERANCE:
+                    # Touching a wall it is leaving (right after a bounce) is
+                    # not an impact
+                    if closing > CLOSING_TOLERANCE:
+                        return dt, edge
+                    # Walls it lies against without closing in (just lifted
+                    # off, or grazing) would hold the conservative step near
+                    # zero: they are left out of the bound and checked at
+                    # the end of a step of at most SLIDE_STEP instead
+                    if lying is None:
+                        lying = {}
+                    lying[edge] = min(gap, 0.0) - CONTACT_TOLERANCE
+                    continue
+                # _safe_step, inlined for the common case
+                root = math.sqrt(closing * closing + 2.0 * curvature * gap)
+                if closing > 0:
+                    h = 2.0 * gap / (closing + root)
+                elif curvature > 0:
+                    h = (root - closing) / curvature
+                else:
+                    continue
+                if h < step:
+                    step = h
+            for _ in range(4):
+                if dt + step <= window:
+                    break
+                window = dt + min(step, 2.0 * window)
+                speed = self._speed_bound(window)
+                curvature = self.gravity + (self.drag + 2.0 * omega) * speed + spin
+                step = self._safe_step([gaps[edge] for edge in range(len(gaps))
+                                        if not lying or edge not in lying], curvature)
+            step = min(step, window - dt)
+            step = max(step, CONTACT_TOLERANCE * 1e-3)
+            if lying:
+                step = min(step, SLIDE_STEP)
+                crossed = self._crossing(lying, dt, dt + step)
+                if crossed is not None:
+                    step = crossed - dt
+            dt += step
+            if dt > horizon:
+                return None, None
+        raise RuntimeError("next_impact did not converge")
+
+    def _crossing(self, lying, lo, hi):
+        """
+        First time in (lo, hi] the gap of a wall in `lying` (edge -> depth)
+        drops below its depth, by bisection, or None if none does at hi.
+        """
+        def below(dt):
+            gaps = self._gaps(dt)
+            return any(gaps[edge][0] < depth for edge, depth in lying.items())
+
+        if not below(hi):
+            return None
+        for _ in range(CORNER_ITERATIONS):
+            mid = 0.5 * (lo + hi)
+            if below(mid):
+                hi = mid
+            else:
+                lo = mid
+        return hi
+
+    def _impact(self, edge):
+        """
+        Resolve the ball reaching wall `edge`, which is moving: bounce, or
+        stay on the wall if the rebound would barely leave it.
+        """
+        theta = self.angle0 + self.omega * self.t
+        lx, ly, rvx, rvy = self._local()
+        nx, ny = self.normals[edge]
+        c, s = math.cos(theta), math.sin(theta)
+        # Contact point on the wall, in world space
+        px = self.x - (nx * c - ny * s) * self.radius
+        py = self.y - (nx * s + ny * c) * self.radius
+        pre_vx, pre_vy = self.vx, self.vy
+        # The wall's own velocity has no normal part in its frame
+        vn = rvx * nx + rvy * ny
+        if vn < 0:
+            rebound = -self.restitution * vn
+            fx, fy = self._force(theta, lx, ly, rvx, rvy)
+            press = -(fx * nx + fy * ny)
+            if press > 0 and 2.0 * rebound < CONTACT_FLIGHT * press:
+                self._land(edge, lx, ly, rvx - vn * nx, rvy - vn * ny)
+            else:
+                self._set_local(self.t, lx, ly, rvx + (rebound - vn) * nx,
+                                rvy + (rebound - vn) * ny)
+        self.impacts += 1
+        return Impact(self.t, edge, pre_vx, pre_vy, self.vx, self.vy, px, py)
+
+    def _land(self, edge, lx, ly, rvx, rvy):
+        """
+        Put the ball in contact with `edge` (velocity already along it),
+        or pin it in the corner if it also touches a neighbouring wall that
+        holds it.
+        """
+        nx, ny = self.normals[edge]
+        # Snap onto the contact line
+        gap = self._gap(edge, lx, ly)
+        lx -= gap * nx
+        ly -= gap * ny
+        sides = len(self.normals)
+        touching = [j for j in ((edge - 1) % sides, (edge + 1) % sides)
+                    if self._gap(j, lx, ly) <= 10 * CONTACT_TOLERANCE]
+        self.contact = (edge,)
+        if touching:
+            other = touching[0]
+            lx, ly = self._corner(edge, other)
+            theta = self.angle0 + self.omega * self.t
+            held = self._corner_forces(edge, other, theta, lx, ly)
+            if held[0] >= 0 and held[1] >= 0:
+                self.contact = (edge, other)
+                rvx = rvy = 0.0
+            elif held[0] >= 0:
+                # Slides along `edge`, but not into the other wall
+                mx, my = self.normals[other]
+                if rvx * mx + rvy * my < 0:
+                    rvx = rvy = 0.0
+            else:
+                self.contact = ()
+        self._set_local(self.t, lx, ly, rvx, rvy)
+
+    def _corner(self, a, b):
+        """Local position of a ball touching walls a and b."""
+        (ax, ay), (bx, by) = self.normals[a], self.normals[b]
+        da = self.offsets[a] + self.radius
+        db = self.offsets[b] + self.radius
+        det = ax * by - ay * bx
+        return (da * by - db * ay) / det, (ax * db - bx * da) / det
+
+    def _corner_forces(self, a, b, theta, lx, ly):
+        """
+        Normal forces (per unit mass) walls a and b need to hold a ball at
+        rest in their corner; a negative one means that wall lets go.
+        """
+        fx, fy = self._force(theta, lx, ly, 0.0, 0.0)
+        (ax, ay), (bx, by) = self.normals[a], self.normals[b]
+        det = ax * by - ay * bx
+        # Solve na * Na + nb * Nb = -f
+        return ((-fx * by + fy * bx) / det, (-ax * fy + ay * fx) / det)
+
+    # ----- Contact phases -----
+
+    def _slide(self, edge, end):
+        """
+        Slide along `edge` until the ball lifts off, reaches the next wall
+        or time `end`. Returns the Impact at the next wall, if any.
+        """
+        nx, ny = self.normals[edge]
+        ux, uy = -ny, nx
+        d = self.offsets[edge] + self.radius
+        lx, ly, rvx, rvy = self._local()
+        s0 = lx * ux + ly * uy
+        v0 = rvx * ux + rvy * uy
+        t0 = self.t
+        theta0 = self.angle0 + self.omega * t0
+        g, k, w = self.gravity, self.drag, self.omega
+
+        # s'' + k s' - w^2 s = g (ux sin(theta) + uy cos(theta)) - k w d
+        if w != 0:
+            det = w * w * (4.0 * w * w + k * k)
+            p = (-2.0 * w * w * g * ux + k * w * g * uy) / det
+            q = (-2.0 * w * w * g * uy - k * w * g * ux) / det
+            base = k * d / w
+            root = math.sqrt(k * k + 4.0 * w * w)
+            grow, fade = (-k + root) / 2.0, (-k - root) / 2.0
+            e0 = s0 - (p * math.sin(theta0) + q * math.cos(theta0) + base)
+            e1 = v0 - w * (p * math.cos(theta0) - q * math.sin(theta0))
+            amp_grow = (e1 - fade * e0) / (grow - fade)
+            amp_fade = e0 - amp_grow
+
+            def motion(tau):
+                theta = theta0 + w * tau
+                rise, fall = math.exp(grow * tau), math.exp(fade * tau)
+                return (amp_grow * rise + amp_fade * fall
+                        + p * math.sin(theta) + q * math.cos(theta) + base,
+                        grow * amp_grow * rise + fade * amp_fade * fall
+                        + w * (p * math.cos(theta) - q * math.sin(theta)))
+        else:
+            a = g * (ux * math.sin(theta0) + uy * math.cos(theta0))
+
+            def motion(tau):
+                if k == 0:
+                    return s0 + v0 * tau + 0.5 * a * tau * tau, v0 + a * tau
+                decay = math.exp(-k * tau)
+                return (s0 + a / k * tau + (v0 - a / k) * (1.0 - decay) / k,
+                        a / k + (v0 - a / k) * decay)
+
+        sides = len(self.normals)
+        neighbours = ((edge - 1) % sides, (edge + 1) % sides)
+
+        def event(tau):
+            """The wall reached or lifted off from at tau, if any."""
+            s, v = motion(tau)
+            px, py = d * nx + s * ux, d * ny + s * uy
+            for j in neighbours:
+                if self._gap(j, px, py) < -CONTACT_TOLERANCE:
+                    return j
+            if w != 0:
+                fx, fy = self._force(theta0 + w * tau, px, py, v * ux, v * uy)
+                if fx * nx + fy * ny > 0:
+                    return edge
+            return None
+
+        # Times to test: every SLIDE_STEP while the frame turns; without
+        # spin the press is constant and s(tau) changes direction at most
+        # once, so its turning point and the end suffice
+        horizon = end - t0
+        if w != 0:
+            count = int(math.ceil(horizon / SLIDE_STEP))
+            samples = (min(i * SLIDE_STEP, horizon) for i in range(1, count + 1))
+        else:
+            samples = [horizon]
+            if k > 0 and a != 0:
+                ratio = -(a / k) / (v0 - a / k) if v0 != a / k else 0.0
+                if 0 < ratio < 1:
+                    samples.insert(0, min(-math.log(ratio) / k, horizon))
+            elif k == 0 and a * v0 < 0:
+                samples.insert(0, min(-v0 / a, horizon))
+        lo, hit = 0.0, None
+        for tau in samples:
+            hit = event(tau)
+            if hit is not None:
+                hi = tau
+                break
+            lo = tau
+        if hit is not None:
+            for _ in range(CORNER_ITERATIONS):
+                mid = 0.5 * (lo + hi)
+                found = event(mid)
+                if found is None:
+                    lo = mid
+                else:
+                    hi, hit = mid, found
+            tau = hi
+        else:
+            tau = horizon
+        s, v = motion(tau)
+        self._set_local(t0 + tau, d * nx + s * ux, d * ny + s * uy, v * ux, v * uy)
+        if hit is None:
+            return None
+        self.contact = ()
+        if hit == edge:
+            return None
+        return self._impact(hit)
+
+    def _pinned(self, end):
+        """
+        Ride the corner until one of its walls lets go or time `end`,
+        then slide along the other wall or fly.
+        """
+        a, b = self.contact
+        lx, ly = self._corner(a, b)
+        w = self.omega
+        theta0 = self.angle0 + w * self.t
+        release = math.inf
+        if w != 0:
+            # Each wall's force is A sin(theta) + B cos(theta) + C: sample
+            # it at three angles to get A, B and C
+            f0 = self._corner_forces(a, b, 0.0, lx, ly)
+            f1 = self._corner_forces(a, b, math.pi / 2, lx, ly)
+            f2 = self._corner_forces(a, b, math.pi, lx, ly)
+            for i in range(2):
+                const = 0.5 * (f0[i] + f2[i])
+                sin_part = f1[i] - const
+                cos_part = f0[i] - const
+                release = min(release, _first_drop(sin_part, cos_part, const, theta0, w))
+        tau = min(release, end - self.t)
+        self._set_local(self.t + tau, lx, ly, 0.0, 0.0)
+        if tau < release:
+            return
+        held = self._corner_forces(a, b, theta0 + w * tau, lx, ly)
+        if held[0] > held[1]:
+            self.contact = (a,)
+        else:
+            self.contact = (b,)
+        if max(held) <= 0:
+            self.contact = ()
+
+    def advance(self, dt):
+        """Move the ball `dt` frames along its flight, without collisions."""
+        self.x, self.y, self.vx, self.vy = self.flight(dt)
+        self.t += dt
+
+    def run(self, duration, max_events=None):
+        """
+        Jump from impact to impact for `duration` frames. Returns the list
+        of Impact records; the simulator ends at t + duration.
+        """
+        end = self.t + duration
+        events = []
+        while (max_events is None or len(events) < max_events) and self.t < end:
+            if len(self.contact) == 2:
+                self._pinned(end)
+                continue
+            if self.contact:
+                impact = self._slide(self.contact[0], end)
+                if impact is not None:
+                    events.append(impact)
+                continue
+            dt, edge = self.next_impact(end - self.t)
+            if dt is None:
+                self.advance(end - self.t)
+                break
+            self.advance(dt)
+            events.append(self._impact(edge))
+        return events
+
+
+def _first_drop(sin_part, cos_part, const, theta, omega):
+    """
+    Frames until A sin + B cos + C, with the angle starting at `theta` and
+    turning at `omega`, first goes negative (inf if it never does).
+    """
+    amplitude = math.hypot(sin_part, cos_part)
+    if amplitude <= const:
+        return math.inf
+    if amplitude <= -const:
+        return 0.0
+    # A sin(x) + B cos(x) = R sin(x + phase)
+    phase = math.atan2(cos_part, sin_part)
+    crossing = math.asin(-const / amplitude)
+    period = 2.0 * math.pi / abs(omega)
+    best = math.inf
+    for root in (crossing, math.pi - crossing):
+        # Going negative: the derivative omega * R cos(root) is below zero
+        if omega * math.cos(root) >= 0:
+            continue
+        tau = ((root - phase - theta) / omega) % period
+        best = min(best, tau)
+    return best
+
+
+def benchmark(duration=216000.0):
+    """
+    Simulate `duration` frames (an hour at 60 FPS) of the default ball in
+    the default hexagon, spinning and still, with the default gravity,
+    friction and restitution, and time the same ball stepped frame by
+    frame with kernels.collide_ball for comparison.
+    Returns [(label, impacts, seconds, stepped seconds)].
+    """
+    from hexsim.hexagon import Hexagon
+    from hexsim.kernels import collide_ball
+
+    rows = []
+    for label, speed in (("spinning", 0.01), ("still", 0.0)):
+        hexagon = Hexagon(400.0, 300.0, rotation_speed=speed)
+        sim = EventSimulator(hexagon, 400.0, 300.0, 3.0, -2.0, 10.0)
+        start = time.perf_counter()
+        events = sim.run(duration)
+        elapsed = time.perf_counter() - start
+
+        x, y, vx, vy = 400.0, 300.0, 3.0, -2.0
+        start = time.perf_counter()
+        for _ in range(int(duration)):
+            vy += GRAVITY
+            x += vx
+            y += vy
+            vx *= FRICTION
+            vy *= FRICTION
+            hexagon.update()
+            x, y, vx, vy = collide_ball(x, y, vx, vy, 10.0, hexagon.vertex_list(),
+                                        hexagon.center_x, hexagon.center_y, speed)
+        rows.append((label, len(events), elapsed, time.perf_counter() - start))
+    return rows
+
+
+if __name__ == "__main__":
+    for label, impacts, elapsed, stepped in benchmark():
+        print("1 simulated hour, %s hexagon: %d impacts in %.1f ms (stepped: %.1f ms)" % (
+            label, impacts, elapsed * 1000, stepped * 1000))
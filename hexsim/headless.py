@@ -0,0 +1,162 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import runpy
+import subprocess
+import sys
+import time
+
+from hexsim.scripts import REPO_ROOT, resolve
+
+# ----- Configuration Constants -----
+FRAMES = 600                     # Frames per headless run (10 s at 60 FPS)
+TIMEOUT = 120.0                  # Seconds before a run is killed
+RESULT_PREFIX = "HEXSIM-RESULT "
+
+
+class _Finished(BaseException):
+    """Raised from the patched flip once enough frames were shown. A
+    BaseException, so the scripts' own `except Exception` cannot eat it."""
+
+
+class FakeClock:
+    """pygame.time.Clock that never sleeps but reports the requested pace."""
+
+    def __init__(self):
+        self._fps = 0.0
+        self._last = 0
+
+    def tick(self, framerate=0):
+        self._last = int(1000 / framerate) if framerate else 0
+        self._fps = framerate
+        _virtual["ms"] += self._last
+        return self._last
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return self._last
+
+    def get_rawtime(self):
+        return self._last
+
+    def get_fps(self):
+        return float(self._fps)
+
+
+# Virtual milliseconds, advanced by FakeClock.tick and returned by get_ticks
+_virtual = {"ms": 0}
+
+
+def run_headless(path, frames=FRAMES, seed=0, on_frame=None):
+    """
+    Run a model script in this process with a dummy video driver until it
+    has shown `frames` frames, and return a result dict.
+
+    pygame.display.flip/update are wrapped to count frames (and call
+    `on_frame(count)` after each), the frame clock never sleeps, and
+    `random` and NumPy are seeded with `seed`. The result holds the status
+    ("ok", "exit" if the script ended on its own, "error"), the frame
+    count, the wall time and a SHA-256 of the last frame's pixels.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    import pygame
+
+    random.seed(seed)
+    try:
+        import numpy as np
+        np.random.seed(seed)
+    except ImportError:
+        pass
+
+    state = {"frames": 0, "digest": None}
+    real_flip = pygame.display.flip
+    real_update = pygame.display.update
+
+    def shown():
+        state["frames"] += 1
+        if on_frame is not None:
+            on_frame(state["frames"])
+        if state["frames"] >= frames:
+            surface = pygame.display.get_surface()
+            if surface is not None:
+                state["digest"] = hashlib.sha256(pygame.image.tobytes(surface, "RGB")).hexdigest()
+            raise _Finished
+
+    def flip():
+        real_flip()
+        shown()
+
+    def update(*args, **kwargs):
+        real_update(*args, **kwargs)
+        shown()
+
+    pygame.display.flip = flip
+    pygame.display.update = update
+    pygame.time.Clock = FakeClock
+    pygame.time.delay = pygame.time.wait = lambda ms: 0
+    pygame.time.get_ticks = lambda: _virtual["ms"]
+
+    status, error = "exit", None
+    start = time.perf_counter()
+    try:
+        runpy.run_path(resolve(path), run_name="__main__")
+    except _Finished:
+        status = "ok"
+    except SystemExit:
+        pass
+    except Exception as exc:
+        status, error = "error", "%s: %s" % (type(exc).__name__, exc)
+    elapsed = time.perf_counter() - start
+    pygame.display.flip = real_flip
+    pygame.display.update = real_update
+    return {"status": status, "error": error, "frames": state["frames"],
+            "seconds": elapsed, "digest": state["digest"]}
+
+
+def run_script(path, frames=FRAMES, seed=0, timeout=TIMEOUT, module="hexsim.headless",
+               extra_args=()):
+    """
+    Run `path` headless in a fresh interpreter (so scripts cannot leak
+    state into each other) and return its result dict.
+    """
+    command = [sys.executable, "-m", module, resolve(path),
+               "--frames", str(frames), "--seed", str(seed)]
+    command.extend(extra_args)
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    try:
+        done = subprocess.run(command, capture_output=True, text=True,
+                              timeout=timeout, env=env, cwd=REPO_ROOT)
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout", "error": "killed after %gs" % timeout,
+                "frames": None, "seconds": timeout, "digest": None}
+    for line in reversed(done.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    tail = (done.stderr.strip().splitlines() or ["exit code %d" % done.returncode])[-1]
+    return {"status": "error", "error": tail, "frames": None,
+            "seconds": None, "digest": None}
+
+
+def make_parser(description):
+    """Command line of a headless child: script, --frames, --seed."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("script")
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def report(result):
+    """Print a child's result where run_script looks for it."""
+    sys.stdout.flush()
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    args = make_parser("Run one model script headless.").parse_args()
+    report(run_headless(args.script, args.frames, args.seed))
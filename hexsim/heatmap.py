@@ -0,0 +1,124 @@
+import math
+import sys
+
+import numpy as np
+
+from hexsim.engine import World, fill_hexagon
+
+# ----- Configuration Constants -----
+BINS = 256                       # Histogram cells per side
+MARGIN = 1.05                    # Extent beyond the container's circumradius
+# Heat ramp: black -> red -> yellow -> white, by position in [0, 1]
+RAMP_STOPS = (0.0, 0.4, 0.8, 1.0)
+RAMP_COLORS = ((0, 0, 0), (200, 0, 0), (255, 220, 0), (255, 255, 255))
+
+
+class OccupancyMap:
+    """
+    A fixed 2-D histogram of where balls are, in the container's rotating
+    frame: positions are turned back by the current angle before binning,
+    so a ball resting in a corner of a spinning hexagon lands in the same
+    cell every frame. Memory is BINS**2 counters however long the run.
+
+    `extent` is the half-width of the square covered, in pixels, around
+    the rotation center. Positions outside are ignored.
+    """
+
+    def __init__(self, center_x, center_y, extent, bins=BINS):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.extent = extent
+        self.bins = bins
+        self.scale = bins / (2.0 * extent)
+        self.counts = np.zeros(bins * bins, dtype=np.int64)
+        self.frames = 0
+
+    @classmethod
+    def for_container(cls, container, bins=BINS):
+        return cls(container.center_x, container.center_y,
+                   container.radius * MARGIN, bins)
+
+    def add(self, x, y, angle=None, rotor=None):
+        """
+        Accumulate one frame of positions (floats or arrays). The frame's
+        rotation is given as `angle` or as a trig.Rotor (no trig call).
+        """
+        if rotor is not None:
+            c, s = rotor.c, rotor.s
+        elif angle is not None:
+            c, s = math.cos(angle), math.sin(angle)
+        else:
+            raise ValueError("add needs the frame's angle or rotor")
+        dx = np.asarray(x, dtype=np.float64) - self.center_x
+        dy = np.asarray(y, dtype=np.float64) - self.center_y
+        ix = np.floor((dx * c + dy * s + self.extent) * self.scale).astype(np.int64)
+        iy = np.floor((dy * c - dx * s + self.extent) * self.scale).astype(np.int64)
+        inside = (ix >= 0) & (ix < self.bins) & (iy >= 0) & (iy < self.bins)
+        cells = (ix * self.bins + iy)[inside]
+        if cells.size == 1:
+            self.counts[cells[0]] += 1
+        elif cells.size:
+            self.counts += np.bincount(cells, minlength=self.counts.size)
+        self.frames += 1
+
+    def add_world(self, world, rotor=None):
+        """
+        Accumulate a World's balls in the frame of `rotor`, by default its
+        container's. A NestedContainers has no single frame: pass the
+        rotor of the shell to follow, e.g. world.hexagon.shells[-1].rotor.
+        """
+        if rotor is None:
+            rotor = getattr(world.hexagon, "rotor", None)
+            if rotor is None:
+                raise ValueError("%s has no single rotating frame; pass the rotor "
+                                 "to bin in" % type(world.hexagon).__name__)
+        balls = world.balls
+        self.add(balls.x, balls.y, rotor=rotor)
+
+    def grid(self):
+        """Counts as a (bins, bins) array indexed [x, y] in the local frame."""
+        return self.counts.reshape(self.bins, self.bins)
+
+    def image(self):
+        """(bins, bins, 3) uint8 heat image, log-scaled, indexed [x, y]."""
+        heat = np.log1p(self.grid().astype(np.float64))
+        top = heat.max()
+        if top > 0:
+            heat /= top
+        ramp = np.column_stack([np.interp(heat.ravel(), RAMP_STOPS, channel)
+                                for channel in zip(*RAMP_COLORS)])
+        return ramp.astype(np.uint8).reshape(self.bins, self.bins, 3)
+
+    def save(self, path, size=None):
+        """Write the heat image with pygame (format from the extension)."""
+        import pygame
+
+        surface = pygame.surfarray.make_surface(self.image())
+        if size is not None:
+            surface = pygame.transform.scale(surface, (size, size))
+        pygame.image.save(surface, path)
+
+
+def benchmark(count=5000, frames=600, seed=0):
+    """
+    Run a gravity world of `count` balls for `frames` frames, binning
+    every frame, and return (occupancy map, seconds per add).
+    """
+    import time
+
+    world = fill_hexagon(World(ball_radius=2.0), count, seed=seed)
+    heat = OccupancyMap.for_container(world.hexagon)
+    spent = 0.0
+    for _ in range(frames):
+        world.step()
+        start = time.perf_counter()
+        heat.add_world(world)
+        spent += time.perf_counter() - start
+    return heat, spent / frames
+
+
+if __name__ == "__main__":
+    heat, per_frame = benchmark()
+    path = sys.argv[1] if len(sys.argv) > 1 else "occupancy.png"
+    heat.save(path, 512)
+    print("5000 balls: %.3f ms per frame binned, map written to %s" % (per_frame * 1000, path))
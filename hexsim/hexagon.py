@@ -0,0 +1,126 @@
+import math
+
+import numpy as np
+
+from hexsim.polygon import ConvexPolygon, polygon_penetration
+from hexsim.trig import Rotor, polygon_vertex_list, polygon_vertices
+
+# ----- Configuration Constants -----
+HEX_RADIUS = 200                 # Distance from center to vertex (pixels)
+ROTATION_SPEED = 0.01            # Radians per frame
+RESTITUTION = 0.8                # Bounciness of the walls
+
+
+class Hexagon:
+    """
+    A regular hexagon spinning about its center at a constant rate.
+
+    The rotation is tracked twice: `angle` for anything that needs the
+    number, and a trig.Rotor basis used to build the vertices, so stepping
+    and drawing never call cos/sin. Assigning `angle` resets the basis.
+    """
+
+    def __init__(self, center_x, center_y, radius=HEX_RADIUS,
+                 rotation_speed=ROTATION_SPEED, sides=6):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.radius = radius
+        self.sides = sides
+        self.rotation_speed = rotation_speed
+        self.rotor = Rotor()
+        self.angle = 0.0
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @angle.setter
+    def angle(self, value):
+        self._angle = value
+        self.rotor.reset(value)
+
+    @property
+    def polygon(self):
+        """The hexagon's shape as a ConvexPolygon in its local frame."""
+        shape = getattr(self, "_polygon", None)
+        if shape is None or shape.sides != self.sides or shape.circumradius != self.radius:
+            shape = self._polygon = ConvexPolygon.regular(self.sides, self.radius)
+        return shape
+
+    @property
+    def inradius(self):
+        """Distance from the center to the middle of an edge."""
+        return self.radius * math.cos(math.pi / self.sides)
+
+    def update(self):
+        self._angle += self.rotation_speed
+        self.rotor.advance(self.rotation_speed)
+
+    def vertices(self):
+        """Return the current vertices as a (sides, 2) array."""
+        return polygon_vertices(self.center_x, self.center_y, self.radius,
+                                self.rotor, self.sides)
+
+    def vertex_list(self):
+        """Return the current vertices as a list of (x, y) floats."""
+        return polygon_vertex_list(self.center_x, self.center_y, self.radius,
+                                   self.rotor, self.sides)
+
+    def penetration(self, balls):
+        """How far each ball of a BallSet reaches past the walls (0 if clear)."""
+        return polygon_penetration(balls.x, balls.y, balls.radius, self.polygon,
+                                   self.rotor, self.center_x, self.center_y)
+
+
+def collide_walls(balls, hexagon, restitution=RESTITUTION, vertices=None, log=None):
+    """
+    Resolve ball/wall contacts for every ball of a BallSet at once.
+
+    This is the vectorized form of `check_collision`/`reflect_ball` from
+    chatgpt-o3-mini(high): push the ball back inside along the wall's
+    inward normal, and reflect the normal part of its velocity relative to
+    the moving wall. Because the container is convex, the signed distance
+    to each edge's line is enough: a ball that tunnelled outside is pulled
+    back in instead of being pushed further away. Edges are processed one
+    after the other, like the scalar loop.
+
+    Impacts are recorded in `log` (a collisionlog.CollisionLog) if given.
+    """
+    if vertices is None:
+        vertices = hexagon.vertices()
+    x, y = balls.x, balls.y
+    vx, vy = balls.vx, balls.vy
+    radius = balls.radius
+    cx, cy = hexagon.center_x, hexagon.center_y
+    omega = hexagon.rotation_speed
+    sides = len(vertices)
+    for i in range(sides):
+        ax, ay = vertices[i]
+        bx, by = vertices[(i + 1) % sides]
+        length = math.hypot(bx - ax, by - ay)
+        if length == 0:
+            continue
+        # Inward normal (vertices run counter-clockwise in array coordinates)
+        nx = -(by - ay) / length
+        ny = (bx - ax) / length
+        dist = (x - ax) * nx + (y - ay) * ny
+        hit = np.flatnonzero(dist < radius)
+        if len(hit) == 0:
+            continue
+        d = dist[hit]
+        px = x[hit] - d * nx
+        py = y[hit] - d * ny
+        penetration = radius[hit] - d
+        x[hit] += nx * penetration
+        y[hit] += ny * penetration
+        # Wall velocity at the contact point: omega x (p - center)
+        wvx = -omega * (py - cy)
+        wvy = omega * (px - cx)
+        vn = (vx[hit] - wvx) * nx + (vy[hit] - wvy) * ny
+        scale = np.where(vn < 0, (1.0 + restitution) * vn, 0.0)
+        vx[hit] -= scale * nx
+        vy[hit] -= scale * ny
+        if log is not None:
+            hard = vn < 0
+            log.append(hit[hard], i, px[hard], py[hard], nx, ny,
+                       -vn[hard], -scale[hard])
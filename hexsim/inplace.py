@@ -0,0 +1,466 @@
+import argparse
+import hashlib
+import math
+import os
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+
+import pygame
+from pygame.math import Vector2
+
+from hexsim.headless import FRAMES, run_script
+from hexsim.scripts import REPO_ROOT, resolve
+
+# ----- Configuration Constants -----
+FPS = 60
+FRAME_DT = int(1000 / FPS) / 1000.0   # dt the scripts see from a 60 FPS clock tick
+SIZE = (800, 600)
+
+
+class InPlaceFrame(ABC):
+    """
+    One model's frame, operation for operation, on vectors allocated once.
+
+    The scripts these replace spell every step as a Vector2 expression
+    (`ball_pos - A`, `n * penetration`, `rel - v_rel_n`), and each one
+    returns a new Vector2. Here the same arithmetic runs through `update`,
+    `+=`, `-=`, `*=`, `normalize_ip` and `reflect_ip` on scratch vectors,
+    in the script's order, so positions and pixels come out identical.
+    Hexagon vertices live in a fixed list of Vector2 updated in place,
+    which pygame.draw.polygon takes as is.
+
+    Subclasses set SCRIPT and implement `frame(screen, dt)`: physics and
+    drawing as the script does them, minus the flip and clock tick.
+    """
+
+    SCRIPT = None
+
+    def __init__(self):
+        self.verts = [Vector2() for _ in range(6)]
+        self._a = Vector2()
+        self._b = Vector2()
+        self._c = Vector2()
+        self._d = Vector2()
+        self._e = Vector2()
+
+    @abstractmethod
+    def frame(self, screen, dt):
+        """Advance one frame by `dt` seconds and draw it on `screen`."""
+
+    def _circle(self, screen, color, pos, radius):
+        # The scripts truncate the center; a float center would round
+        pygame.draw.circle(screen, color, (int(pos.x), int(pos.y)), radius)
+
+
+class O3MiniHigh(InPlaceFrame):
+    """chatgpt-o3-mini(high): closest point per edge, moving-wall restitution."""
+
+    SCRIPT = "chatgpt-o3/chatgpt-o3-mini(high).py"
+    GRAVITY = 500
+    FRICTION = 0.99
+    BALL_RADIUS = 10
+    BALL_RESTITUTION = 0.9
+    HEX_RADIUS = 250
+    HEX_ANGULAR_SPEED = 0.5
+    OFFSETS = tuple(i * (2 * math.pi / 6) for i in range(6))
+
+    def __init__(self):
+        super().__init__()
+        self.center = Vector2(SIZE[0] / 2, SIZE[1] / 2)
+        self.pos = Vector2(self.center)
+        self.vel = Vector2(150, -200)
+        self.angle = 0.0
+
+    def frame(self, screen, dt):
+        pos, vel, step = self.pos, self.vel, self._a
+        vel.y += self.GRAVITY * dt
+        step.update(vel)
+        step *= dt
+        pos += step
+        vel *= self.FRICTION
+
+        self.angle += self.HEX_ANGULAR_SPEED * dt
+        cx, cy, r = self.center.x, self.center.y, self.HEX_RADIUS
+        for v, offset in zip(self.verts, self.OFFSETS):
+            theta = self.angle + offset
+            v.update(cx + r * math.cos(theta), cy + r * math.sin(theta))
+        self._collide()
+
+        screen.fill((30, 30, 30))
+        pygame.draw.polygon(screen, (200, 200, 200), self.verts, 3)
+        self._circle(screen, (255, 100, 100), pos, self.BALL_RADIUS)
+
+    def _collide(self):
+        pos, vel, verts = self.pos, self.vel, self.verts
+        ab, ac, closest, diff, wall = self._a, self._b, self._c, self._d, self._e
+        radius = self.BALL_RADIUS
+        for i in range(6):
+            a = verts[i]
+            ab.update(verts[(i + 1) % 6])
+            ab -= a
+            ac.update(pos)
+            ac -= a
+            length_sq = ab.length_squared()
+            t = ac.dot(ab) / length_sq if length_sq != 0 else 0
+            t = max(0, min(1, t))
+            closest.update(ab)
+            closest *= t
+            closest += a
+            diff.update(pos)
+            diff -= closest
+            dist = diff.length()
+            if dist >= radius:
+                continue
+            if dist == 0:
+                diff.update(a)
+                diff += verts[(i + 1) % 6]
+                diff *= 0.5
+                diff.update(pos.x - diff.x, pos.y - diff.y)
+                if diff.length() == 0:
+                    diff.update(1, 0)
+                else:
+                    diff.normalize_ip()
+            else:
+                diff.normalize_ip()
+            n = diff
+            ac.update(n)
+            ac *= radius - dist
+            pos += ac
+            w = self.HEX_ANGULAR_SPEED
+            wall.update(-w * (closest.y - self.center.y), w * (closest.x - self.center.x))
+            # rel = vel - wall, split into normal and tangential parts
+            ab.update(vel)
+            ab -= wall
+            if ab.dot(n) < 0:
+                ac.update(n)
+                ac *= ab.dot(n)
+                ab -= ac
+                ac *= self.BALL_RESTITUTION
+                ab -= ac
+                vel.update(wall)
+                vel += ab
+
+
+class O4MiniHigh(InPlaceFrame):
+    """chatgpt-o4-mini(high): edge planes first, then corners, one hit per frame."""
+
+    SCRIPT = "chatgpt-o4/chatgpt-o4-mini(high).py"
+    HEX_RADIUS = 200
+    BALL_RADIUS = 15
+    GRAVITY = 500.0
+    AIR_FRICTION = 0.05
+    RESTITUTION = 0.9
+    SPIN_RATE = math.radians(30)
+
+    def __init__(self):
+        super().__init__()
+        self.hexagon = tuple((self.HEX_RADIUS * math.cos(2 * math.pi * i / 6),
+                              self.HEX_RADIUS * math.sin(2 * math.pi * i / 6))
+                             for i in range(6))
+        self.center = Vector2(SIZE[0] / 2, SIZE[1] / 2)
+        self.pos = Vector2(SIZE[0] / 2, SIZE[1] / 2)
+        self.vel = Vector2(150, -50)
+        self.angle = 0.0
+
+    def frame(self, screen, dt):
+        pos, vel, step = self.pos, self.vel, self._a
+        self.angle += self.SPIN_RATE * dt
+        vel.y += self.GRAVITY * dt
+        vel *= max(0.0, 1.0 - self.AIR_FRICTION * dt)
+        step.update(vel)
+        step *= dt
+        pos += step
+
+        c, s = math.cos(self.angle), math.sin(self.angle)
+        cx, cy = self.center.x, self.center.y
+        for v, (x, y) in zip(self.verts, self.hexagon):
+            v.update(x * c - y * s + cx, x * s + y * c + cy)
+        if not self._edges():
+            self._corners()
+
+        screen.fill((30, 30, 30))
+        pygame.draw.polygon(screen, (200, 200, 200), self.verts, width=2)
+        self._circle(screen, (255, 100, 100), pos, self.BALL_RADIUS)
+
+    def _bounce(self, normal, contact, push):
+        # v_rel = vel - v_wall; v_rel -= (1 + e) * vn * n; vel = v_rel + v_wall.
+        # `contact` may be the scratch vector _a, so it is read first.
+        vel, wall, rel = self.vel, self._d, self._e
+        wall.update(-self.SPIN_RATE * (contact.y - self.center.y),
+                    self.SPIN_RATE * (contact.x - self.center.x))
+        rel.update(vel)
+        rel -= wall
+        vn = rel.dot(normal)
+        if vn >= 0.0:
+            return False
+        scaled = self._a
+        scaled.update(normal)
+        scaled *= (1 + self.RESTITUTION) * vn
+        rel -= scaled
+        vel.update(rel)
+        vel += wall
+        scaled.update(normal)
+        scaled *= push
+        self.pos += scaled
+        return True
+
+    def _edges(self):
+        pos, verts = self.pos, self.verts
+        edge, normal, proj = self._b, self._c, self._a
+        for i in range(6):
+            p1 = verts[i]
+            edge.update(verts[(i + 1) % 6])
+            edge -= p1
+            normal.update(-edge.y, edge.x)
+            normal.normalize_ip()
+            proj.update(pos)
+            proj -= p1
+            dist = proj.dot(normal)
+            proj.update(normal)
+            proj *= dist
+            proj.update(pos.x - proj.x, pos.y - proj.y)
+            t = ((proj.x - p1.x) * edge.x + (proj.y - p1.y) * edge.y) / edge.dot(edge)
+            if dist < self.BALL_RADIUS and 0.0 <= t <= 1.0:
+                if self._bounce(normal, proj, self.BALL_RADIUS - dist):
+                    return True
+        return False
+
+    def _corners(self):
+        pos, normal = self.pos, self._c
+        for p in self.verts:
+            normal.update(pos)
+            normal -= p
+            d = normal.length()
+            if d < self.BALL_RADIUS and d > 1e-6:
+                normal /= d
+                self._bounce(normal, p, self.BALL_RADIUS - d)
+                break
+
+
+class O4MiniLow(InPlaceFrame):
+    """
+    chatgpt-o4-mini(low): inward-normal edge test, plain reflection. The
+    script itself stops on its first frame (`ball_vel.y += ...` inside
+    main() makes ball_vel local); this runs it on the module-level ball
+    the script plainly meant.
+    """
+
+    SCRIPT = "chatgpt-o4/chatgpt-o4-mini(low).py"
+    HEX_RADIUS = 250
+    ANGULAR_SPEED = math.radians(30)
+    BALL_RADIUS = 15
+    GRAVITY = 500
+    FRICTION = 0.999
+    OFFSETS = tuple(i * math.radians(60) for i in range(6))
+
+    def __init__(self):
+        super().__init__()
+        self.center = Vector2(SIZE[0] // 2, SIZE[1] // 2)
+        self.pos = Vector2(SIZE[0] // 2, 100)
+        self.vel = Vector2(200, 0)
+        self.angle = 0.0
+
+    def frame(self, screen, dt):
+        pos, vel, step = self.pos, self.vel, self._a
+        self.angle += self.ANGULAR_SPEED * dt
+        cx, cy, r = self.center.x, self.center.y, self.HEX_RADIUS
+        for v, offset in zip(self.verts, self.OFFSETS):
+            theta = self.angle + offset
+            v.update(cx + r * math.cos(theta), cy + r * math.sin(theta))
+
+        vel.y += self.GRAVITY * dt
+        vel *= self.FRICTION
+        step.update(vel)
+        step *= dt
+        pos += step
+        self._collide()
+
+        screen.fill((30, 30, 30))
+        pygame.draw.polygon(screen, (200, 200, 200), self.verts, 4)
+        self._circle(screen, (200, 50, 50), pos, self.BALL_RADIUS)
+
+    def _collide(self):
+        pos, vel, verts, center = self.pos, self.vel, self.verts, self.center
+        edge, normal, proj, wall, scratch = self._a, self._b, self._c, self._d, self._e
+        for i in range(6):
+            a = verts[i]
+            edge.update(verts[(i + 1) % 6])
+            edge -= a
+            normal.update(edge.y, -edge.x)
+            normal.normalize_ip()
+            if (center.x - a.x) * normal.x + (center.y - a.y) * normal.y < 0:
+                normal *= -1
+            dist = (pos.x - a.x) * normal.x + (pos.y - a.y) * normal.y
+            proj.update(normal)
+            proj *= dist
+            proj.update(pos.x - proj.x, pos.y - proj.y)
+            along = (proj.x - a.x) * edge.x + (proj.y - a.y) * edge.y
+            if 0 < along < edge.length_squared() and dist < self.BALL_RADIUS:
+                wall.update(-(proj.y - center.y), proj.x - center.x)
+                wall *= self.ANGULAR_SPEED
+                scratch.update(vel)
+                scratch -= wall
+                proj.update(normal)
+                proj *= 2 * scratch.dot(normal)
+                scratch -= proj
+                vel.update(scratch)
+                vel += wall
+                proj.update(normal)
+                proj *= self.BALL_RADIUS - dist
+                pos += proj
+
+
+class GrokBeta(InPlaceFrame):
+    """grok-beta: closest point per edge, velocity mirrored off a static wall."""
+
+    SCRIPT = "grok-beta/grok-beta.py"
+    GRAVITY = 0.5
+    FRICTION = 0.01
+    BALL_RADIUS = 20
+    HEX_RADIUS = 150
+    ROTATION_SPEED = 0.03
+    OFFSETS = tuple(math.pi / 3 * i for i in range(6))
+
+    def __init__(self):
+        super().__init__()
+        self.center = (SIZE[0] // 2, SIZE[1] // 2)
+        self.pos = Vector2(SIZE[0] // 2, SIZE[1] // 4)
+        self.vel = Vector2(2, 0)
+        self.angle = 0
+
+    def frame(self, screen, dt=None):
+        pos, vel, width, height = self.pos, self.vel, SIZE[0], SIZE[1]
+        screen.fill((0, 0, 0))
+        self.angle += self.ROTATION_SPEED
+        cx, cy, r = self.center[0], self.center[1], self.HEX_RADIUS
+        for v, offset in zip(self.verts, self.OFFSETS):
+            theta = offset + self.angle
+            v.update(cx + r * math.cos(theta), cy + r * math.sin(theta))
+        pygame.draw.polygon(screen, (255, 255, 255), self.verts, 2)
+
+        pos += vel
+        vel.y += self.GRAVITY
+        vel.x *= 1 - self.FRICTION
+        vel.y *= 1 - self.FRICTION
+        self._collide()
+        self._circle(screen, (0, 0, 255), pos, self.BALL_RADIUS)
+
+        if pos.x < self.BALL_RADIUS or pos.x > width - self.BALL_RADIUS:
+            vel.x *= -1
+        if pos.y < self.BALL_RADIUS:
+            vel.y *= -1
+        if pos.y > height + self.BALL_RADIUS:
+            pos.update(width // 2, height // 4)
+            vel.update(2, 0)
+
+    def _collide(self):
+        pos, vel, verts = self.pos, self.vel, self.verts
+        edge, closest, normal = self._a, self._b, self._c
+        for i in range(6):
+            start = verts[i]
+            edge.update(verts[(i + 1) % 6])
+            edge -= start
+            length_sq = edge.length_squared()
+            if length_sq == 0:
+                continue
+            t = max(0, min(1, ((pos.x - start.x) * edge.x + (pos.y - start.y) * edge.y) / length_sq))
+            closest.update(edge)
+            closest *= t
+            closest += start
+            normal.update(pos)
+            normal -= closest
+            if normal.length() < self.BALL_RADIUS:
+                normal.normalize_ip()
+                vel.reflect_ip(normal)
+                pos.update(normal)
+                pos *= self.BALL_RADIUS
+                pos += closest
+
+
+FRAMES_BY_SCRIPT = {cls.SCRIPT: cls for cls in (O3MiniHigh, O4MiniHigh, O4MiniLow, GrokBeta)}
+
+
+def run_frames(cls, frames=FRAMES, dt=FRAME_DT):
+    """
+    Run `cls`'s frame headless `frames` times and return a result like
+    headless.run_headless's (digest of the last frame's pixels) plus the
+    bytes allocated per frame after the first, from tracemalloc's peak.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.display.init()
+    screen = pygame.display.set_mode(SIZE)
+    scene = cls()
+    scene.frame(screen, dt)
+    pygame.display.flip()
+    tracemalloc.start()
+    transient = 0
+    start = time.perf_counter()
+    for _ in range(frames - 1):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        scene.frame(screen, dt)
+        pygame.display.flip()
+        transient += tracemalloc.get_traced_memory()[1] - current
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    digest = hashlib.sha256(pygame.image.tobytes(screen, "RGB")).hexdigest()
+    return {"frames": frames, "seconds": elapsed, "digest": digest,
+            "transient_bytes_per_frame": transient / max(frames - 1, 1)}
+
+
+def compare(script, frames=FRAMES):
+    """
+    Run a script and its in-place frame headless for `frames` frames; returns
+    (original result, in-place result). Identical digests mean identical pixels.
+    """
+    path = resolve(script)
+    cls = FRAMES_BY_SCRIPT[os.path.relpath(path, REPO_ROOT)]
+    original = run_script(path, frames, module="hexsim.allocations", extra_args=("--child",))
+    return original, run_frames(cls, frames)
+
+
+def play(script):
+    """Open a window and run a script's in-place frame at FPS."""
+    cls = FRAMES_BY_SCRIPT[os.path.relpath(resolve(script), REPO_ROOT)]
+    pygame.init()
+    screen = pygame.display.set_mode(SIZE)
+    pygame.display.set_caption("%s (in place)" % os.path.basename(cls.SCRIPT))
+    clock = pygame.time.Clock()
+    scene = cls()
+    running = True
+    while running:
+        dt = clock.tick(FPS) / 1000.0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        scene.frame(screen, dt)
+        pygame.display.flip()
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Check the in-place Vector2 frames against their scripts.")
+    parser.add_argument("scripts", nargs="*", help="default: all of " + ", ".join(FRAMES_BY_SCRIPT))
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--play", metavar="SCRIPT", help="run one in a window instead")
+    args = parser.parse_args(argv)
+    if args.play:
+        play(args.play)
+        return
+    for script in args.scripts or FRAMES_BY_SCRIPT:
+        original, reworked = compare(script, args.frames)
+        name = os.path.relpath(resolve(script), REPO_ROOT)
+        if original["status"] != "ok":
+            # Nothing to compare pixels with; show the in-place figures alone
+            print("%-40s original %s (%s); in place %.1f bytes/frame" % (
+                name, original["status"], original["error"], reworked["transient_bytes_per_frame"]))
+            continue
+        print("%-40s %s  %6.1f -> %5.1f bytes/frame" % (
+            name, "identical" if original["digest"] == reworked["digest"] else "DIFFERENT",
+            original["transient_bytes_per_frame"], reworked["transient_bytes_per_frame"]))
+
+
+if __name__ == "__main__":
+    main()
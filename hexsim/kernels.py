@@ -0,0 +1,126 @@
+import math
+import time
+
+from hexsim.balls import BallSet
+from hexsim.hexagon import RESTITUTION, Hexagon, collide_walls
+
+# ----- Configuration Constants -----
+# Below this many balls the plain-float loop beats the NumPy kernel, whose
+# fixed cost per call (array temporaries, fancy indexing) dominates for a
+# handful of balls. Measured with `python -m hexsim.kernels`.
+BATCH_THRESHOLD = 32
+
+
+def collide_ball(x, y, vx, vy, radius, vertices, center_x, center_y,
+                 omega, restitution=RESTITUTION):
+    """
+    Scalar wall response for one ball, using only Python floats.
+
+    Same math, in the same order, as the vectorized `collide_walls`, so
+    both paths give identical results. Returns the new (x, y, vx, vy).
+    """
+    sides = len(vertices)
+    for i in range(sides):
+        ax, ay = vertices[i]
+        bx, by = vertices[(i + 1) % sides]
+        length = math.hypot(bx - ax, by - ay)
+        if length == 0:
+            continue
+        nx = -(by - ay) / length
+        ny = (bx - ax) / length
+        d = (x - ax) * nx + (y - ay) * ny
+        if d >= radius:
+            continue
+        px = x - d * nx
+        py = y - d * ny
+        penetration = radius - d
+        x += nx * penetration
+        y += ny * penetration
+        wvx = -omega * (py - center_y)
+        wvy = omega * (px - center_x)
+        vn = (vx - wvx) * nx + (vy - wvy) * ny
+        if vn < 0:
+            scale = (1.0 + restitution) * vn
+            vx -= scale * nx
+            vy -= scale * ny
+    return x, y, vx, vy
+
+
+def collide_walls_scalar(balls, hexagon, restitution=RESTITUTION):
+    """Run `collide_ball` over every ball of a BallSet."""
+    vertices = hexagon.vertex_list()
+    cx, cy = hexagon.center_x, hexagon.center_y
+    omega = hexagon.rotation_speed
+    x, y, vx, vy = balls.x, balls.y, balls.vx, balls.vy
+    radius = balls.radius.tolist()
+    for i in range(len(balls)):
+        x[i], y[i], vx[i], vy[i] = collide_ball(
+            float(x[i]), float(y[i]), float(vx[i]), float(vy[i]), radius[i],
+            vertices, cx, cy, omega, restitution)
+
+
+def collide_walls_auto(balls, hexagon, restitution=RESTITUTION,
+                       threshold=None):
+    """
+    Pick the scalar or the batched wall kernel from the ball count.
+    Both give the same result; only the cost differs.
+    """
+    if threshold is None:
+        threshold = BATCH_THRESHOLD
+    if len(balls) < threshold:
+        collide_walls_scalar(balls, hexagon, restitution)
+    else:
+        collide_walls(balls, hexagon, restitution)
+
+
+def collide_container(balls, container, restitution=RESTITUTION, log=None):
+    """
+    Wall response for whatever container a World holds: the dual-path
+    hexagon kernels for a Hexagon, the container's own `collide` for the
+    general convex polygons of hexsim.polygon. With a `log`, a Hexagon
+    always takes the batched kernel, which gives the same result.
+    """
+    if isinstance(container, Hexagon):
+        if log is None:
+            collide_walls_auto(balls, container, restitution)
+        else:
+            collide_walls(balls, container, restitution, log=log)
+    else:
+        container.collide(balls, restitution, log=log)
+
+
+def _time_kernel(kernel, count, repeat):
+    hexagon = Hexagon(0.0, 0.0, 100.0)
+    balls = BallSet(count)
+    # Balls pressed against the lower walls, so every call does real work
+    for i in range(count):
+        balls.add(-50.0 + 100.0 * i / max(1, count), 85.0, 0.0, 2.0, 5.0)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        balls.vy[:] = 2.0
+        kernel(balls, hexagon)
+    return (time.perf_counter() - start) / repeat
+
+
+def calibrate(counts=(1, 2, 4, 8, 16, 32, 64, 128, 256), repeat=200):
+    """
+    Time both paths for several ball counts. Returns the timing rows and
+    the smallest count at which the batched kernel wins.
+    """
+    rows = []
+    crossover = None
+    for count in counts:
+        scalar = _time_kernel(collide_walls_scalar, count, repeat)
+        batched = _time_kernel(collide_walls, count, repeat)
+        rows.append((count, scalar, batched))
+        if crossover is None and batched < scalar:
+            crossover = count
+    return rows, crossover
+
+
+if __name__ == "__main__":
+    rows, crossover = calibrate()
+    print(" balls  scalar(us)  batched(us)")
+    for count, scalar, batched in rows:
+        print("%6d  %10.1f  %11.1f" % (count, scalar * 1e6, batched * 1e6))
+    print("Suggested BATCH_THRESHOLD:", crossover)
@@ -0,0 +1,208 @@
+import numpy as np
+
+from hexsim.polygon import RESTITUTION, ConvexPolygon, collide_polygon, polygon_penetration
+from hexsim.trig import Rotor
+
+
+class Shell:
+    """
+    One container of a nest. `rotation_speed` is relative to the next
+    shell out, so a shell spinning at -w inside one spinning at +w stands
+    still on screen.
+    """
+
+    def __init__(self, polygon, rotation_speed):
+        self.polygon = polygon
+        self.rotation_speed = rotation_speed
+        self.local = Rotor()
+        self.local_angle = 0.0
+        # World transform, composed by NestedContainers.update
+        self.rotor = Rotor()
+        self.angle = 0.0
+        self.omega = rotation_speed
+
+
+class NestedContainers:
+    """
+    Convex shells nested about a common center, innermost first, each
+    spinning relative to its parent.
+
+    World transforms are composed once per frame in `update`. In
+    `collide`, a ball's distance to the center picks the gap it is in,
+    and it is tested against the two shells bounding that gap only: the
+    inner one from outside and the outer one from inside. The cost per
+    ball does not grow with the number of shells.
+
+    The radial bands of the shells (inradius to circumradius) must not
+    overlap, so every ball is in the band of at most one shell.
+    """
+
+    def __init__(self, shells, center_x, center_y):
+        self.shells = list(shells)
+        if not self.shells:
+            raise ValueError("at least one shell is needed")
+        self.center_x = center_x
+        self.center_y = center_y
+        self._gap = None
+        self._gap_key = None
+        self._inradius = np.array([s.polygon.inradius for s in self.shells])
+        self._circumradius = np.array([s.polygon.circumradius for s in self.shells])
+        if np.any(self._inradius[1:] <= self._circumradius[:-1]):
+            raise ValueError("shell bands overlap; order shells inner to outer "
+                             "and leave a gap between them")
+        self.update_transforms()
+
+    @classmethod
+    def regular(cls, center_x, center_y, radii, rotation_speeds, sides=6):
+        """Nest of regular polygons, one per radius, innermost first."""
+        shells = [Shell(ConvexPolygon.regular(sides, r), w)
+                  for r, w in zip(radii, rotation_speeds)]
+        return cls(shells, center_x, center_y)
+
+    # Container interface used by World and fill_hexagon
+    @property
+    def radius(self):
+        return self.shells[-1].polygon.circumradius
+
+    @property
+    def inradius(self):
+        return self.shells[-1].polygon.inradius
+
+    @property
+    def sides(self):
+        return self.shells[-1].polygon.sides
+
+    @property
+    def rotation_speed(self):
+        return self.shells[-1].omega
+
+    def update(self):
+        for shell in self.shells:
+            shell.local_angle += shell.rotation_speed
+            shell.local.advance(shell.rotation_speed)
+        self.update_transforms()
+
+    def update_transforms(self):
+        """Compose each shell's world rotation from the outside in."""
+        c, s, angle, omega = 1.0, 0.0, 0.0, 0.0
+        for shell in reversed(self.shells):
+            lc, ls = shell.local.c, shell.local.s
+            c, s = c * lc - s * ls, s * lc + c * ls
+            angle += shell.local_angle
+            omega += shell.rotation_speed
+            shell.rotor.c, shell.rotor.s = c, s
+            shell.angle = angle
+            shell.omega = omega
+
+    def vertices(self, k=-1):
+        """World-space vertices of shell k as a (sides, 2) array."""
+        shell = self.shells[k]
+        v = shell.polygon.vertices
+        wx, wy = shell.rotor.rotate(v[:, 0], v[:, 1])
+        return np.column_stack((wx + self.center_x, wy + self.center_y))
+
+    def _gaps(self, balls):
+        """
+        Index of the gap each ball is in: gap g lies between shell g - 1
+        (from outside) and shell g (from inside). Gap 0 is the inside of
+        the innermost shell.
+        """
+        dx = balls.x - self.center_x
+        dy = balls.y - self.center_y
+        rho = np.hypot(dx, dy)
+        # First shell whose circumradius reaches the ball
+        gap = np.searchsorted(self._circumradius, rho)
+        count = len(self.shells)
+        # Inside a shell's band the side of its wall decides the gap
+        inner_edge = self._inradius[np.minimum(gap, count - 1)]
+        in_band = np.flatnonzero((gap < count) & (rho > inner_edge))
+        for k in np.unique(gap[in_band]):
+            idx = in_band[gap[in_band] == k]
+            shell = self.shells[k]
+            c, s = shell.rotor.c, shell.rotor.s
+            lx = dx[idx] * c + dy[idx] * s
+            ly = dy[idx] * c - dx[idx] * s
+            poly = shell.polygon
+            edge = poly.edge_facing(lx, ly)
+            outside = poly.signed_distance(lx, ly, edge) < 0
+            gap[idx[outside]] += 1
+        return np.minimum(gap, count)
+
+    def reclassify(self):
+        """Forget the cached gaps; call after moving balls by hand."""
+        self._gap = None
+
+    def collide(self, balls, restitution=RESTITUTION, log=None):
+        """
+        Resolve ball/wall contacts against the two shells of each gap.
+        In `log`, edges are numbered across shells, innermost first.
+
+        Gaps are classified from the distance to the center the first
+        time, then kept: walls never let a ball change gap, and a fast
+        ball whose center crossed an inner wall within one frame would
+        otherwise be classified on the wrong side of it. The cache is
+        rebuilt whenever balls are added or removed (BallSet.generation).
+        """
+        key = (id(balls), balls.generation)
+        if self._gap is None or self._gap_key != key:
+            self._gap = self._gaps(balls)
+            self._gap_key = key
+        gap = self._gap
+        order = np.argsort(gap, kind="stable")
+        bounds = np.searchsorted(gap[order], np.arange(len(self.shells) + 2))
+        touched = []
+        count = len(self.shells)
+        edge_base = np.cumsum([0] + [s.polygon.sides for s in self.shells])
+        for g in range(count + 1):
+            idx = order[bounds[g]:bounds[g + 1]]
+            if len(idx) == 0:
+                continue
+            # A ball that escaped every shell is pulled back by the outermost
+            k = min(g, count - 1)
+            outer = self.shells[k]
+            hit = collide_polygon(
+                balls, idx, outer.polygon, outer.rotor, self.center_x,
+                self.center_y, outer.omega, restitution,
+                log=log, edge_base=edge_base[k])
+            touched.append(hit)
+            if g == count:
+                # Back inside the outermost shell, so from now on it is
+                # kept out of the next shell in too
+                gap[hit] = count - 1
+            if 0 < g < count:
+                inner = self.shells[g - 1]
+                touched.append(collide_polygon(
+                    balls, idx, inner.polygon, inner.rotor, self.center_x,
+                    self.center_y, inner.omega, restitution, outside=True,
+                    log=log, edge_base=edge_base[g - 1]))
+        if not touched:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(touched))
+
+    def penetration(self, balls):
+        """
+        How far each ball of a BallSet reaches past the two shells of its
+        gap (0 if clear of both). Gaps come from the cache kept by
+        `collide` while it is valid, so a ball that crossed a wall still
+        counts against the gap it belongs in.
+        """
+        key = (id(balls), balls.generation)
+        gap = self._gap if self._gap is not None and self._gap_key == key else self._gaps(balls)
+        depth = np.zeros(len(balls))
+        count = len(self.shells)
+        for g in np.unique(gap):
+            idx = np.flatnonzero(gap == g)
+            x, y, radius = balls.x[idx], balls.y[idx], balls.radius[idx]
+            outer = self.shells[min(g, count - 1)]
+            d = polygon_penetration(x, y, radius, outer.polygon, outer.rotor,
+                                    self.center_x, self.center_y)
+            if g == count:
+                # Outside every shell: the whole way back in counts
+                d = np.maximum(d, radius)
+            if 0 < g < count:
+                inner = self.shells[g - 1]
+                d = np.maximum(d, polygon_penetration(
+                    x, y, radius, inner.polygon, inner.rotor, self.center_x,
+                    self.center_y, outside=True))
+            depth[idx] = d
+        return depth
@@ -0,0 +1,169 @@
+import time
+
+import numpy as np
+import pygame
+
+from hexsim.balls import BallSet, pack_color
+from hexsim.render import SpriteRenderer
+
+# ----- Configuration Constants -----
+# The scripts' named colours take the first palette slots
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GREEN = (0, 255, 0)
+NAMED_COLORS = (BLACK, WHITE, RED, BLUE, GREEN)
+RAMP_START = 16                  # First palette index of the speed ramp
+MAX_SPEED = 20.0                 # Speed (px/frame) at the top of the ramp
+SPEED_STEPS = 1024               # Entries of the speed -> index lookup table
+# Speed ramp: slow blue -> cyan -> yellow -> fast red, by position in [0, 1]
+RAMP_STOPS = (0.0, 0.35, 0.7, 1.0)
+RAMP_COLORS = ((40, 60, 255), (0, 220, 255), (255, 230, 0), (255, 40, 0))
+
+
+def make_palette():
+    """The 256 palette entries: named colours, greys, then the speed ramp."""
+    palette = list(NAMED_COLORS)
+    greys = RAMP_START - len(palette)
+    palette.extend((v, v, v) for v in np.linspace(32, 224, greys).astype(int).tolist())
+    t = np.linspace(0.0, 1.0, 256 - RAMP_START)
+    ramp = np.column_stack([np.interp(t, RAMP_STOPS, channel) for channel in zip(*RAMP_COLORS)])
+    palette.extend(tuple(row) for row in ramp.astype(int).tolist())
+    return palette
+
+
+PALETTE = make_palette()
+
+
+class PaletteCanvas:
+    """
+    An 8-bit indexed drawing surface for mosaic and thumbnail views.
+
+    The scripts only ever draw a handful of colours, so a simulation's
+    canvas can hold one byte per pixel instead of four: a wall of canvases
+    takes a quarter of the memory, and anything that moves whole canvases
+    (fill, copy, reading the pixels back) touches a quarter of the bytes.
+    It is not a faster way to draw: balls and the palette-expanding blit
+    in `present` cost as much as on a 32-bit surface or more (`benchmark`
+    times each phase). Use it where memory or pixel traffic is the limit,
+    and plain display-format surfaces otherwise.
+
+    Ball colour comes from speed through a SPEED_STEPS-long lookup table
+    into the palette's RAMP_START.. ramp, and balls are drawn with a
+    SpriteRenderer (which keeps paletted sprites). pygame.draw calls with
+    the named RGB colours work on `surface` as usual: they map to their
+    palette slot.
+
+    `present` is the only place the pixels reach the display format: one
+    blit expands the indices through the palette.
+    """
+
+    def __init__(self, size, max_speed=MAX_SPEED, palette=PALETTE):
+        self.surface = pygame.Surface(size, depth=8)
+        self.surface.set_palette(palette)
+        self.max_speed = max_speed
+        self.renderer = SpriteRenderer()
+        self._colors = np.array([pack_color(c) for c in palette], dtype=np.uint32)
+        level = np.sqrt(np.linspace(0.0, 1.0, SPEED_STEPS))
+        self._speed_lut = (RAMP_START + np.rint(level * (len(palette) - 1 - RAMP_START))).astype(np.uint8)
+
+    def speed_index(self, vx, vy):
+        """Palette index for each speed, through the lookup table."""
+        step = np.hypot(vx, vy) * ((SPEED_STEPS - 1) / self.max_speed)
+        return self._speed_lut[np.minimum(step, SPEED_STEPS - 1).astype(np.intp)]
+
+    def speed_colors(self, vx, vy):
+        """The palette colours of speed_index, packed 0xRRGGBB."""
+        return self._colors[self.speed_index(vx, vy)]
+
+    def fill(self, color=BLACK):
+        # A memset through the pixel array; SDL's 8-bit fill is ~25x slower
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        pixels.fill(self.surface.map_rgb(color))
+        del pixels                   # Unlocks the surface
+
+    def draw_balls(self, balls):
+        """Draw a BallSet coloured by speed (its own colours are ignored)."""
+        colored = BallSet.from_columns(balls.x, balls.y, balls.vx, balls.vy, balls.radius,
+                                       self.speed_colors(balls.vx, balls.vy))
+        self.renderer.draw(self.surface, colored)
+
+    def present(self, screen, dest=(0, 0)):
+        screen.blit(self.surface, dest)
+
+
+def benchmark(count=2000, canvases=16, frames=30, seed=0):
+    """
+    Draw one world onto `canvases` 800x600 canvases per frame, with 32-bit
+    canvases and with PaletteCanvas, timing each phase separately, plus
+    two ways pixels leave a canvas: a copy (kept frames, thumbnails) and a
+    read-back to bytes (encoding, streaming).
+
+    Returns ([(phase, 32-bit seconds per canvas, 8-bit seconds per
+    canvas)], identical pixels). The 8-bit canvas wins on memory, fill,
+    copy and read-back, which scale with bytes. Drawing balls and the
+    palette-expanding `present` cost about the same or somewhat more,
+    so it is not the faster path for drawing alone.
+    """
+    from hexsim.engine import HEIGHT, WIDTH, World, fill_hexagon
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    world = fill_hexagon(World(ball_radius=3.0, ball_collisions=False), count, seed=seed)
+    paletted = [PaletteCanvas((WIDTH, HEIGHT)) for _ in range(canvases)]
+    full = [pygame.Surface((WIDTH, HEIGHT)).convert() for _ in range(canvases)]
+    renderer = SpriteRenderer()
+
+    def draw_full(canvas):
+        pygame.draw.polygon(canvas, BLUE, world.hexagon.vertex_list(), 2)
+        balls = world.balls
+        renderer.draw(canvas, BallSet.from_columns(
+            balls.x, balls.y, balls.vx, balls.vy, balls.radius,
+            paletted[0].speed_colors(balls.vx, balls.vy)))
+
+    def draw_paletted(canvas):
+        pygame.draw.polygon(canvas.surface, BLUE, world.hexagon.vertex_list(), 2)
+        canvas.draw_balls(world.balls)
+
+    phases = (
+        ("fill", lambda c: c.fill(BLACK), lambda c: c.fill(BLACK)),
+        ("draw", draw_full, draw_paletted),
+        ("present", lambda c: screen.blit(c, (0, 0)), lambda c: c.present(screen)),
+        ("copy", lambda c: c.copy(), lambda c: c.surface.copy()),
+        ("read back", lambda c: pygame.image.tobytes(c, "RGBX"),
+         lambda c: pygame.image.tobytes(c.surface, "P")),
+    )
+    totals = [[0.0, 0.0] for _ in phases]
+    for _ in range(frames):
+        world.step()
+        for row, (_name, *calls) in zip(totals, phases):
+            for k, (call, targets) in enumerate(zip(calls, (full, paletted))):
+                start = time.perf_counter()
+                for canvas in targets:
+                    call(canvas)
+                row[k] += time.perf_counter() - start
+    per = frames * canvases
+    rows = [(name, a / per, b / per) for (name, *_), (a, b) in zip(phases, totals)]
+    # Both ways on the same world state for the pixel comparison
+    full[0].fill(BLACK)
+    draw_full(full[0])
+    screen.blit(full[0], (0, 0))
+    reference = pygame.image.tobytes(screen, "RGB")
+    paletted[0].fill(BLACK)
+    draw_paletted(paletted[0])
+    paletted[0].present(screen)
+    return rows, reference == pygame.image.tobytes(screen, "RGB")
+
+
+if __name__ == "__main__":
+    import os
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    rows, same = benchmark()
+    print("16 canvases of 2000 balls, ms per canvas (%s pixels):" % (
+        "identical" if same else "DIFFERENT"))
+    print("%-10s %7s %7s" % ("", "32-bit", "8-bit"))
+    for name, full, paletted in rows:
+        print("%-10s %7.3f %7.3f" % (name, full * 1000, paletted * 1000))
+    print("16 canvases: %.1f MB -> %.1f MB" % (16 * 800 * 600 * 4 / 2**20, 16 * 800 * 600 / 2**20))
@@ -0,0 +1,305 @@
+import math
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from hexsim.balls import BallSet
+from hexsim.broadphase import UniformGrid, collide_balls
+from hexsim.engine import World, fill_hexagon
+from hexsim.kernels import collide_container
+
+# ----- Shared memory layout -----
+# One block holds every column the workers touch, as rows of `capacity`
+# float64 values, followed by the int64 index buffers filled by the parent.
+STATE_COLUMNS = ("x", "y", "vx", "vy", "radius")
+OUTPUT_COLUMNS = ("x", "y", "vx", "vy")
+INDEX_COLUMNS = ("order", "core")
+
+# Worker-side globals, set by _attach
+_shm = None
+_cols = None
+
+
+def _layout(capacity):
+    """Return {name: (offset, dtype)} and the total size in bytes."""
+    offsets = {}
+    offset = 0
+    for name in STATE_COLUMNS:
+        offsets[name] = (offset, np.float64)
+        offset += capacity * 8
+    for name in OUTPUT_COLUMNS:
+        offsets["out_" + name] = (offset, np.float64)
+        offset += capacity * 8
+    for name in INDEX_COLUMNS:
+        offsets[name] = (offset, np.int64)
+        offset += capacity * 8
+    return offsets, offset
+
+
+def _map_columns(buf, capacity):
+    offsets, _ = _layout(capacity)
+    return {name: np.ndarray(capacity, dtype=dtype, buffer=buf, offset=offset)
+            for name, (offset, dtype) in offsets.items()}
+
+
+def _attach(name, capacity):
+    """Pool initializer: map the parent's shared block into this worker."""
+    global _shm, _cols
+    _shm = shared_memory.SharedMemory(name=name)
+    _cols = _map_columns(_shm.buf, capacity)
+
+
+def _integrate_range(job):
+    """
+    Phase 1: integrate and collide with the walls a contiguous range of
+    balls, in place. Uses the exact same kernels as World.step, so the
+    results are bit-identical to the single-process engine.
+    """
+    lo, hi, gravity, friction, restitution, hexagon = job
+    balls = BallSet.from_columns(*(_cols[name][lo:hi] for name in STATE_COLUMNS))
+    balls.update(gravity, friction)
+    collide_container(balls, hexagon, restitution)
+    return hi - lo
+
+
+def _collide_walls_range(job):
+    """
+    Phase 3: the wall pass again on a range of balls, for those the
+    ball/ball solver pushed through a wall, as in World.step.
+    """
+    lo, hi, restitution, hexagon = job
+    balls = BallSet.from_columns(*(_cols[name][lo:hi] for name in STATE_COLUMNS))
+    collide_container(balls, hexagon, restitution)
+    return hi - lo
+
+
+def _collide_sector(job):
+    """
+    Phase 2: resolve ball/ball contacts for one angular sector.
+
+    The worker gathers the balls it owns plus a halo of foreign balls lying
+    within one grid cell of its wedge, solves the contacts on that copy and
+    writes back only the balls it owns, into the output columns.
+    """
+    (sector, sectors, starts, core_count, center, grid_args, restitution,
+     iterations) = job
+    order = _cols["order"]
+    lo, hi = starts[sector], starts[sector + 1]
+    owned = order[lo:hi]
+    if len(owned) == 0:
+        return 0
+
+    halo = []
+    if sectors > 1:
+        cell = grid_args[3] * 2.0
+        before = (sector - 1) % sectors
+        after = (sector + 1) % sectors
+        candidates = [order[starts[before]:starts[before + 1]]]
+        if sectors > 2:
+            candidates.append(order[starts[after]:starts[after + 1]])
+            candidates.append(_cols["core"][:core_count])
+        candidates = np.unique(np.concatenate(candidates))
+        near = _wedge_distance(_cols["x"][candidates] - center[0],
+                               _cols["y"][candidates] - center[1],
+                               sector, sectors) < cell
+        halo = candidates[near]
+        # Core balls of this very sector are already owned
+        if len(halo):
+            halo = halo[_sector_of(_cols["x"][halo] - center[0],
+                                   _cols["y"][halo] - center[1],
+                                   sectors) != sector]
+    index = np.concatenate([owned, halo]) if len(halo) else owned
+    sub = BallSet.from_columns(*(_cols[name][index] for name in STATE_COLUMNS))
+    grid = UniformGrid(*grid_args)
+    pairs = grid.candidate_pairs(sub.x, sub.y)
+    for _ in range(iterations):
+        collide_balls(sub, grid, restitution, pairs)
+    mine = len(owned)
+    for name in OUTPUT_COLUMNS:
+        _cols["out_" + name][owned] = getattr(sub, name)[:mine]
+    return mine
+
+
+def _sector_of(dx, dy, sectors):
+    """Angular sector index of offsets (dx, dy) from the hexagon center."""
+    theta = np.arctan2(dy, dx) + math.pi
+    sector = (theta * (sectors / (2 * math.pi))).astype(np.int64)
+    np.minimum(sector, sectors - 1, out=sector)
+    return sector
+
+
+def _wedge_distance(dx, dy, sector, sectors):
+    """
+    Distance from offsets (dx, dy) to the wedge of `sector`; zero inside.
+    Outside the wedge it is the distance to the nearest boundary ray.
+    """
+    width = 2 * math.pi / sectors
+    best = None
+    for phi in (sector * width - math.pi, (sector + 1) * width - math.pi):
+        ux, uy = math.cos(phi), math.sin(phi)
+        along = dx * ux + dy * uy
+        dist = np.where(along > 0, np.abs(dx * uy - dy * ux), np.hypot(dx, dy))
+        best = dist if best is None else np.minimum(best, dist)
+    inside = _sector_of(dx, dy, sectors) == sector
+    best[inside] = 0.0
+    return best
+
+
+class ParallelWorld:
+    """
+    Runs a World's step across a process pool.
+
+    The ball columns move into one `multiprocessing.shared_memory` block
+    (the World's BallSet is rebound to views of it, so drawing code keeps
+    working). Each step has two phases:
+
+    1. integration and wall collisions on contiguous index ranges, which
+       is bit-for-bit identical to `World.step`;
+    2. ball/ball collisions on angular sectors of the hexagon, one per
+       worker, with halo exchange for balls near sector boundaries, then
+       the wall pass again on index ranges.
+
+    Phase 2 sums contact impulses in a different order than the single
+    process solver, so ball/ball results agree only to rounding.
+
+    The shared block has room for `capacity` balls (as many as the World
+    holds by default). Balls can be added to `world.balls` up to that;
+    past it the BallSet raises ValueError, since the workers could not
+    see rows outside the block.
+    """
+
+    def __init__(self, world, workers=None, capacity=None):
+        self.world = world
+        self.workers = workers or os.cpu_count() or 1
+        balls = world.balls
+        n = len(balls)
+        # A shared block cannot be empty, even for an empty World
+        self.capacity = capacity = max(1, n, capacity or 0)
+        _, size = _layout(capacity)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.cols = _map_columns(self.shm.buf, capacity)
+        for name in STATE_COLUMNS:
+            self.cols[name][:n] = getattr(balls, name)
+        color = np.zeros(capacity, dtype=np.uint32)
+        color[:n] = balls.color
+        world.balls = BallSet.from_columns(
+            *(self.cols[name] for name in STATE_COLUMNS),
+            color=color, count=n, growable=False)
+        self.pool = multiprocessing.Pool(
+            self.workers, initializer=_attach,
+            initargs=(self.shm.name, capacity))
+
+    def step(self):
+        world = self.world
+        hexagon = world.hexagon
+        n = len(world.balls)
+        chunk = max(1, -(-n // self.workers))
+        # Phase 1 uses the hexagon as it will be after this frame's update
+        hexagon.update()
+        jobs = [(lo, min(lo + chunk, n), world.gravity, world.friction,
+                 world.restitution, hexagon)
+                for lo in range(0, n, chunk)]
+        self.pool.map(_integrate_range, jobs)
+
+        if world.ball_collisions and n:
+            self._collide()
+            self.pool.map(_collide_walls_range,
+                          [(lo, min(lo + chunk, n), world.restitution, hexagon)
+                           for lo in range(0, n, chunk)])
+        world.frame += 1
+
+    def _collide(self):
+        world = self.world
+        hexagon = world.hexagon
+        n = len(world.balls)
+        sectors = self.workers
+        cols = self.cols
+        dx = cols["x"][:n] - hexagon.center_x
+        dy = cols["y"][:n] - hexagon.center_y
+        sector = _sector_of(dx, dy, sectors)
+        order = np.argsort(sector, kind="stable")
+        cols["order"][:n] = order
+        starts = np.searchsorted(sector[order], np.arange(sectors + 1))
+        # Balls close to the center can be near a non-adjacent sector
+        cell = world.grid.cell_size
+        core_radius = cell / math.sin(min(2 * math.pi / sectors, math.pi / 2))
+        core = np.flatnonzero(dx * dx + dy * dy < core_radius * core_radius)
+        cols["core"][:len(core)] = core
+
+        grid = world.grid
+        grid_args = (hexagon.center_x, hexagon.center_y, hexagon.radius,
+                     grid.cell_size / 2)
+        jobs = [(s, sectors, starts, len(core),
+                 (hexagon.center_x, hexagon.center_y), grid_args,
+                 world.ball_restitution, world.iterations)
+                for s in range(sectors)]
+        self.pool.map(_collide_sector, jobs)
+        for name in OUTPUT_COLUMNS:
+            cols[name][:n] = cols["out_" + name][:n]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+            # Give the World its own memory back before releasing the block
+            balls = self.world.balls
+            own = BallSet(len(balls))
+            own.extend(balls.x, balls.y, balls.vx, balls.vy, balls.radius,
+                       balls.color)
+            self.world.balls = own
+            self.cols = None
+            self.shm.close()
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def check_wall_exactness(count=20000, steps=30, workers=2, seed=0):
+    """
+    Step the same world with and without the pool, ball/ball collisions
+    off, and return True when every column matches bit for bit.
+    """
+    serial = fill_hexagon(World(ball_collisions=False), count, seed=seed)
+    shared = fill_hexagon(World(ball_collisions=False), count, seed=seed)
+    with ParallelWorld(shared, workers) as pworld:
+        for _ in range(steps):
+            serial.step()
+            pworld.step()
+        return all(np.array_equal(getattr(serial.balls, name),
+                                  getattr(shared.balls, name))
+                   for name in STATE_COLUMNS)
+
+
+def benchmark(count=1000000, steps=10, max_workers=None, seed=0):
+    """
+    Time `steps` frames for 1..max_workers processes and return a list of
+    (workers, seconds per step, speedup over one worker).
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    rows = []
+    for workers in range(1, max_workers + 1):
+        world = fill_hexagon(World(ball_radius=0.25, gravity=0.0), count,
+                             seed=seed)
+        with ParallelWorld(world, workers) as pworld:
+            pworld.step()
+            start = time.perf_counter()
+            for _ in range(steps):
+                pworld.step()
+            elapsed = (time.perf_counter() - start) / steps
+        rows.append((workers, elapsed, rows[0][1] / elapsed if rows else 1.0))
+    return rows
+
+
+if __name__ == "__main__":
+    print("Wall collisions bit-exact:", check_wall_exactness())
+    print("workers  ms/step  speedup")
+    for workers, elapsed, speedup in benchmark():
+        print("%7d  %7.1f  %6.2fx" % (workers, elapsed * 1000, speedup))
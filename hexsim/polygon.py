@@ -0,0 +1,305 @@
+import numpy as np
+
+from hexsim.trig import Rotor, unit_polygon
+
+# ----- Configuration Constants -----
+RESTITUTION = 0.8
+# Up to this many edges every edge is tested; above it, the edge facing
+# the ball is found by binary search over the vertex angles, and only the
+# edges a ball of that radius can reach from there are tested (all of
+# them again once that is a third of the polygon).
+LINEAR_EDGE_LIMIT = 12
+
+
+class ConvexPolygon:
+    """
+    A convex polygon in its own local frame, with per-edge data
+    precomputed once: inward unit normals, line offsets, edge lengths and
+    the polar angle of every vertex.
+
+    For a point p in the local frame, `normals[i] . p - offsets[i]` is its
+    signed distance to edge i, positive inside. The origin must lie inside
+    the polygon; it is the point the container spins about.
+    """
+
+    def __init__(self, vertices):
+        v = np.asarray(vertices, dtype=np.float64)
+        if v.ndim != 2 or v.shape[1] != 2 or len(v) < 3:
+            raise ValueError("a polygon needs at least 3 (x, y) vertices")
+        # Store vertices counter-clockwise (in array coordinates)
+        area2 = np.sum(v[:, 0] * np.roll(v[:, 1], -1) - np.roll(v[:, 0], -1) * v[:, 1])
+        if area2 < 0:
+            v = v[::-1].copy()
+        edges = np.roll(v, -1, axis=0) - v
+        self.lengths = np.hypot(edges[:, 0], edges[:, 1])
+        if np.any(self.lengths == 0):
+            raise ValueError("polygon has repeated vertices")
+        self.normals = np.column_stack((-edges[:, 1], edges[:, 0])) / self.lengths[:, None]
+        self.offsets = np.einsum("ij,ij->i", self.normals, v)
+        # Convex iff every vertex is on the inner side of every edge
+        inside = v @ self.normals.T - self.offsets
+        if np.any(inside < -1e-9 * self.lengths.max()):
+            raise ValueError("polygon is not convex")
+        if np.any(self.offsets >= 0):
+            raise ValueError("the origin must lie strictly inside the polygon")
+        self.vertices = v
+        self.sides = len(v)
+        self.circumradius = float(np.hypot(v[:, 0], v[:, 1]).max())
+        self.inradius = float(-self.offsets.max())
+
+        # Vertex angles, rotated so they increase from the first entry
+        angles = np.arctan2(v[:, 1], v[:, 0])
+        start = int(np.argmin(angles))
+        self._angle_order = np.roll(np.arange(self.sides), -start)
+        self._angles = angles[self._angle_order]
+        self._reach = None
+
+    @classmethod
+    def regular(cls, sides, radius):
+        """A regular polygon with one vertex on the +x axis."""
+        return cls(unit_polygon(sides) * radius)
+
+    def edge_facing(self, x, y):
+        """
+        Index of the edge crossed by the ray from the origin through each
+        local point (x, y), found by binary search over vertex angles.
+        """
+        theta = np.arctan2(y, x)
+        k = np.searchsorted(self._angles, theta, side="right") - 1
+        # Angles below the first vertex wrap to the last edge
+        return self._angle_order[k % self.sides]
+
+    @property
+    def reach(self):
+        """
+        reach[k]: the least signed distance from any point of an edge's
+        sector (the triangle origin, v[i], v[i + 1]) to the line of edge
+        i + k, over all i. A ball in edge i's sector whose radius is at most
+        reach[k] cannot touch edge i + k. Computed on first use, O(sides**2).
+        """
+        if self._reach is None:
+            v, n, d = self.vertices, self.normals, self.offsets
+            i = np.arange(self.sides)
+            nxt = np.roll(v, -1, axis=0)
+            reach = np.empty(self.sides)
+            for k in range(self.sides):
+                j = (i + k) % self.sides
+                # Distance is linear, so a triangle's minimum is at one of
+                # its corners: the origin (at -d[j] from line j) or v[i], v[i + 1]
+                reach[k] = min((-d[j]).min(),
+                               (n[j, 0] * v[:, 0] + n[j, 1] * v[:, 1] - d[j]).min(),
+                               (n[j, 0] * nxt[:, 0] + n[j, 1] * nxt[:, 1] - d[j]).min())
+            self._reach = reach
+        return self._reach
+
+    def edge_offsets(self, radius):
+        """
+        Offsets from the facing edge that balls up to `radius` may touch,
+        with one more edge of margin on each side for balls that a push
+        from one wall moves into a neighbouring sector. The margin is not
+        a proof: a long enough chain of pushes could still carry a ball
+        past it, which is why collide_polygon tests every edge once the
+        window holds a third of them.
+        """
+        near = np.flatnonzero(self.reach < radius)
+        return np.unique(np.concatenate([near - 1, near, near + 1]) % self.sides)
+
+    def signed_distance(self, x, y, edge):
+        """Signed distance of local points to the given edges."""
+        return self.normals[edge, 0] * x + self.normals[edge, 1] * y - self.offsets[edge]
+
+
+class Container:
+    """
+    A convex polygon spinning about a fixed center, at `rotation_speed`
+    radians per frame. Drop-in for Hexagon in World.
+    """
+
+    def __init__(self, polygon, center_x, center_y, rotation_speed=0.01):
+        self.polygon = polygon
+        self.center_x = center_x
+        self.center_y = center_y
+        self.rotation_speed = rotation_speed
+        self.rotor = Rotor()
+        self.angle = 0.0
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @angle.setter
+    def angle(self, value):
+        self._angle = value
+        self.rotor.reset(value)
+
+    @property
+    def radius(self):
+        return self.polygon.circumradius
+
+    @property
+    def inradius(self):
+        return self.polygon.inradius
+
+    @property
+    def sides(self):
+        return self.polygon.sides
+
+    def update(self):
+        self._angle += self.rotation_speed
+        self.rotor.advance(self.rotation_speed)
+
+    def vertices(self):
+        """Current world-space vertices as a (sides, 2) array."""
+        lx, ly = self.polygon.vertices[:, 0], self.polygon.vertices[:, 1]
+        wx, wy = self.rotor.rotate(lx, ly)
+        return np.column_stack((wx + self.center_x, wy + self.center_y))
+
+    def to_local(self, x, y):
+        """World positions to the container's local frame."""
+        dx = x - self.center_x
+        dy = y - self.center_y
+        c, s = self.rotor.c, self.rotor.s
+        return dx * c + dy * s, dy * c - dx * s
+
+    def collide(self, balls, restitution=RESTITUTION, log=None):
+        """
+        Resolve ball/wall contacts for a BallSet. Returns the indices of
+        the balls that touched a wall.
+        """
+        return collide_polygon(balls, None, self.polygon, self.rotor,
+                               self.center_x, self.center_y,
+                               self.rotation_speed, restitution, log=log)
+
+    def penetration(self, balls):
+        """How far each ball of a BallSet reaches past the walls (0 if clear)."""
+        return polygon_penetration(balls.x, balls.y, balls.radius, self.polygon,
+                                   self.rotor, self.center_x, self.center_y)
+
+
+def collide_polygon(balls, index, polygon, rotor, center_x, center_y, omega,
+                    restitution=RESTITUTION, outside=False, log=None, edge_base=0):
+    """
+    Resolve contacts between the balls `index` of a BallSet (all of them
+    when None) and a convex polygon spinning at `omega`, whose local frame
+    is given by `rotor` and the center.
+
+    Works in the local frame, where the walls are fixed: positions and
+    velocities are rotated in, pushed out and reflected against the wall's
+    velocity (omega x r), then rotated back. With `outside` the balls are
+    kept out of the polygon instead of in it, using the edge they are
+    deepest behind. Returns the indices of the balls that touched it.
+
+    Impacts are recorded in `log` (a collisionlog.CollisionLog) if given,
+    in world space, with `edge_base` added to the edge indices.
+    """
+    if index is None:
+        x, y, vx, vy, radius = balls.x, balls.y, balls.vx, balls.vy, balls.radius
+    else:
+        x, y = balls.x[index], balls.y[index]
+        vx, vy = balls.vx[index], balls.vy[index]
+        radius = balls.radius[index]
+    c, s = rotor.c, rotor.s
+    dx = x - center_x
+    dy = y - center_y
+    lx = dx * c + dy * s
+    ly = dy * c - dx * s
+    sides = polygon.sides
+    offsets = None
+    if sides > LINEAR_EDGE_LIMIT and len(lx):
+        facing = polygon.edge_facing(lx, ly)
+        # A center already past its facing edge is |p| * depth / -(n . p)
+        # along its ray from that edge's sector, and reaches that much
+        # farther than its radius
+        proj = polygon.normals[facing, 0] * lx + polygon.normals[facing, 1] * ly
+        depth = np.minimum(proj - polygon.offsets[facing], 0.0)
+        beyond = np.hypot(lx, ly) * depth / np.minimum(proj, -1e-12)
+        offsets = polygon.edge_offsets((radius + beyond).max())
+    if offsets is None or 3 * len(offsets) >= sides:
+        # Balls that big get pushed along chains of edges far from the
+        # facing one; testing them all costs little more than the window
+        candidates = [np.full(len(lx), i) for i in range(sides)]
+    else:
+        # The edges within reach of the facing one, visited in increasing
+        # index order per ball like the linear path, so both give the
+        # same result whenever the window holds every edge touched
+        window = np.sort((facing + offsets[:, None]) % sides, axis=0)
+        candidates = list(window)
+
+    if outside:
+        # Distance to a convex polygon from outside: the largest distance
+        # behind any one edge. Resolve against that edge only.
+        depth = np.stack([polygon.signed_distance(lx, ly, e) for e in candidates])
+        pick = np.argmin(depth, axis=0)
+        rows = np.arange(len(lx))
+        edge = np.stack(candidates)[pick, rows]
+        passes = [(edge, -depth[pick, rows], -1.0)]
+    else:
+        passes = [(e, None, 1.0) for e in candidates]
+
+    touched = []
+    lvx = lvy = None
+    for edge, dist, sign in passes:
+        if dist is None:
+            dist = polygon.signed_distance(lx, ly, edge)
+        hit = np.flatnonzero(dist < radius)
+        if len(hit) == 0:
+            continue
+        if lvx is None:
+            lvx = vx * c + vy * s
+            lvy = vy * c - vx * s
+        e = edge[hit]
+        nx = sign * polygon.normals[e, 0]
+        ny = sign * polygon.normals[e, 1]
+        dh = dist[hit]
+        penetration = radius[hit] - dh
+        # Contact point in the local frame, before the push
+        px = lx[hit] - dh * nx
+        py = ly[hit] - dh * ny
+        lx[hit] += nx * penetration
+        ly[hit] += ny * penetration
+        # The wall point moves with omega x p in the local frame too
+        vn = (lvx[hit] + omega * py) * nx + (lvy[hit] - omega * px) * ny
+        scale = np.where(vn < 0, (1.0 + restitution) * vn, 0.0)
+        lvx[hit] -= scale * nx
+        lvy[hit] -= scale * ny
+        if log is not None:
+            hard = np.flatnonzero(vn < 0)
+            qx, qy = px[hard], py[hard]
+            mx, my = nx[hard], ny[hard]
+            log.append(hit[hard] if index is None else index[hit[hard]],
+                       e[hard] + edge_base,
+                       qx * c - qy * s + center_x, qx * s + qy * c + center_y,
+                       mx * c - my * s, mx * s + my * c, -vn[hard], -scale[hard])
+        touched.append(hit)
+    if not touched:
+        return np.empty(0, dtype=np.int64)
+    touched = np.unique(np.concatenate(touched))
+    target = touched if index is None else index[touched]
+    balls.x[target] = lx[touched] * c - ly[touched] * s + center_x
+    balls.y[target] = lx[touched] * s + ly[touched] * c + center_y
+    balls.vx[target] = lvx[touched] * c - lvy[touched] * s
+    balls.vy[target] = lvx[touched] * s + lvy[touched] * c
+    return target
+
+
+def polygon_penetration(x, y, radius, polygon, rotor, center_x, center_y, outside=False):
+    """
+    How far balls at `x`, `y` reach past the walls of a convex polygon
+    whose local frame is given by `rotor` and the center: the radius minus
+    the distance to the nearest edge, or 0 when clear of every edge. With
+    `outside`, how far they reach into the polygon from outside instead,
+    using the edge they are farthest behind (the rule collide_polygon
+    uses).
+    """
+    c, s = rotor.c, rotor.s
+    dx = x - center_x
+    dy = y - center_y
+    lx = dx * c + dy * s
+    ly = dy * c - dx * s
+    dist = (polygon.normals[:, 0] * lx[:, None] + polygon.normals[:, 1] * ly[:, None]
+            - polygon.offsets)
+    if outside:
+        depth = radius + dist.min(axis=1)
+    else:
+        depth = radius - dist.min(axis=1)
+    return np.maximum(depth, 0.0)
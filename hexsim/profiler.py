@@ -0,0 +1,147 @@
+import argparse
+import os
+import signal
+import sys
+from collections import Counter
+
+from hexsim.headless import FRAMES, make_parser, report, run_headless, run_script
+from hexsim.scripts import REPO_ROOT, resolve, script_paths
+
+# ----- Configuration Constants -----
+INTERVAL = 0.001                 # Seconds of CPU time between samples (~1 kHz)
+OUT_DIR = os.path.join(REPO_ROOT, "profiles")
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler driven by SIGPROF. Every INTERVAL seconds of CPU
+    time the kernel interrupts the process and the handler records the
+    interrupted stack as a tuple of code objects; nothing runs on calls
+    or returns, so tiny hot loops are not distorted the way cProfile's
+    per-call tracing distorts them.
+
+    Unix only, main thread only (where Python runs signal handlers).
+    """
+
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._previous = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        self.stacks[tuple(stack)] += 1
+
+    def start(self):
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous or signal.SIG_DFL)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def samples(self):
+        return sum(self.stacks.values())
+
+    def _rooted(self, root_file):
+        """
+        (frames outermost first, count) per stack. With `root_file`, frames
+        above the first one from that file (the harness) are cut off, and
+        samples that never reached it (the harness importing pygame) are
+        dropped.
+        """
+        for stack, count in self.stacks.items():
+            codes = list(reversed(stack))
+            if root_file is not None:
+                for i, code in enumerate(codes):
+                    if code.co_filename == root_file:
+                        codes = codes[i:]
+                        break
+                else:
+                    continue
+            yield codes, count
+
+    def collapsed(self, root_file=None):
+        """
+        Stacks in the collapsed format of flamegraph.pl and speedscope:
+        "outer;...;inner count" per line, cut at `root_file` as in _rooted.
+        """
+        merged = Counter()
+        for codes, count in self._rooted(root_file):
+            key = ";".join("%s:%s" % (os.path.basename(code.co_filename), code.co_name)
+                           for code in codes)
+            merged[key] += count
+        return ["%s %d" % (key, count) for key, count in sorted(merged.items())]
+
+    def top(self, count=3, root_file=None):
+        """
+        The `count` functions with the most samples at the top of the
+        stack, over the same samples as collapsed(root_file).
+        """
+        leaves = Counter()
+        for codes, n in self._rooted(root_file):
+            leaves["%s:%s" % (os.path.basename(codes[-1].co_filename), codes[-1].co_name)] += n
+        return leaves.most_common(count)
+
+
+def output_path(script, out_dir=OUT_DIR):
+    return os.path.join(out_dir, os.path.splitext(os.path.basename(script))[0] + ".collapsed")
+
+
+def profile_script(path, frames=FRAMES, seed=0, out_dir=OUT_DIR, interval=INTERVAL):
+    """
+    Profile one script headless in this process and write its collapsed
+    stacks to out_dir/<script>.collapsed. Returns the headless result
+    with the sample count, the top leaf functions and the output path.
+    """
+    path = resolve(path)
+    profiler = SamplingProfiler(interval)
+    with profiler:
+        result = run_headless(path, frames, seed)
+    os.makedirs(out_dir, exist_ok=True)
+    out = output_path(path, out_dir)
+    with open(out, "w") as f:
+        for line in profiler.collapsed(root_file=path):
+            f.write(line + "\n")
+    result.update(samples=profiler.samples, top=profiler.top(root_file=path), profile=out)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Profile model scripts headless into collapsed-stack files.")
+    parser.add_argument("scripts", nargs="*", help="default: every model script")
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=OUT_DIR)
+    args = parser.parse_args(argv)
+    for path in args.scripts or script_paths():
+        # One interpreter per script: signal state and imports stay separate
+        result = run_script(path, args.frames, args.seed, module="hexsim.profiler",
+                            extra_args=("--child", "--out", args.out))
+        top = ", ".join("%s %d" % tuple(leaf) for leaf in result.get("top", []))
+        print("%-45s %-7s %6s samples  %s" % (
+            os.path.relpath(resolve(path), REPO_ROOT), result["status"],
+            result.get("samples", "-"), top or result["error"] or ""))
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        sys.argv.remove("--child")
+        parser = make_parser("Profile one model script headless.")
+        parser.add_argument("--out", default=OUT_DIR)
+        args = parser.parse_args()
+        report(profile_script(args.script, args.frames, args.seed, args.out))
+    else:
+        main()
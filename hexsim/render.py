@@ -0,0 +1,239 @@
+import time
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+from hexsim.balls import unpack_color
+
+# ----- Configuration Constants -----
+MIN_SPRITE_DIAMETER = 2          # Balls smaller than this (pixels) are drawn as points
+MAX_SPRITES = 256                # Cached (radius, colour) sprites before the cache is cleared
+POINT_COLOR = (255, 100, 100)
+OUTLINE_COLOR = (0, 0, 255)      # The Claude 3.7 scripts' BLUE hexagon
+OUTLINE_WIDTH = 2
+SATURATION_HITS = 8              # Balls in one pixel for full brightness
+MIN_BRIGHTNESS = 0.35            # Brightness of a pixel holding one ball
+
+
+class SpriteRenderer:
+    """
+    Draws a whole BallSet with one Surface.blits call.
+
+    Each distinct (pixel radius, colour) pair is rasterised once with
+    pygame.draw.circle onto a small colour-keyed surface, converted to the
+    target's pixel format and cached; a frame is then a single blits over
+    the position columns. Centers are truncated to ints and radii rounded,
+    as the scripts' `Ball.draw` does, so the pixels equal a per-ball
+    draw.circle loop.
+
+    Balls under MIN_SPRITE_DIAMETER pixels across are plotted as single
+    pixels through surfarray instead, where a sprite blit would cost more
+    than it draws.
+    """
+
+    def __init__(self, min_diameter=MIN_SPRITE_DIAMETER):
+        self.min_diameter = min_diameter
+        self._sprites = {}
+
+    def sprite(self, radius, color, target):
+        """The cached sprite for an int `radius` and packed 0xRRGGBB `color`."""
+        key = (radius, color, target.get_bitsize())
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            if len(self._sprites) >= MAX_SPRITES:
+                self._sprites.clear()
+            rgb = unpack_color(color)
+            size = 2 * radius + 1
+            if target.get_bitsize() == 8:
+                # Paletted target: draw palette indices directly, since
+                # converting an RGB sprite goes through SDL's dithering
+                # colour cube instead of the target's palette
+                index = target.map_rgb(rgb)
+                colorkey = 0 if index != 0 else 1
+                sprite = pygame.Surface((size, size), depth=8)
+                sprite.set_palette(target.get_palette())
+                sprite.fill(colorkey)
+                pygame.draw.circle(sprite, index, (radius, radius), radius)
+            else:
+                # Any key colour will do as long as it is not the ball's
+                colorkey = (0, 0, 0) if rgb != (0, 0, 0) else (255, 255, 255)
+                sprite = pygame.Surface((size, size))
+                sprite.fill(colorkey)
+                pygame.draw.circle(sprite, rgb, (radius, radius), radius)
+                sprite = sprite.convert(target)
+            sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, balls):
+        """Draw every ball of `balls` onto `surface`."""
+        if len(balls) == 0:
+            return
+        x = balls.x.astype(np.int64)
+        y = balls.y.astype(np.int64)
+        radius = np.rint(balls.radius).astype(np.int64)
+        color = balls.color
+        small = 2 * balls.radius < self.min_diameter
+        if small.any():
+            draw_points(surface, x[small], y[small], color[small])
+            big = ~small
+            x, y, radius, color = x[big], y[big], radius[big], color[big]
+            if len(x) == 0:
+                return
+        # Balls keep their order (overlaps paint as in a draw.circle loop);
+        # each one just picks its sprite out of the distinct keys
+        keys, which = np.unique((radius << 24) | color, return_inverse=True)
+        sprites = [self.sprite(int(key) >> 24, int(key) & 0xFFFFFF, surface) for key in keys]
+        positions = zip((x - radius).tolist(), (y - radius).tolist())
+        if len(sprites) == 1:
+            jobs = zip(repeat(sprites[0]), positions)
+        else:
+            jobs = zip(map(sprites.__getitem__, which.tolist()), positions)
+        surface.blits(jobs, doreturn=False)
+
+
+class PointCloudRenderer:
+    """
+    Draws a BallSet as one pixel per ball, straight into the surface's
+    pixel buffer, for 10^5-10^6 balls where even one blit per ball is
+    too slow.
+
+    Positions are truncated and raveled into pixel indices, hits per pixel
+    are counted with np.bincount (np.add.at gives the same counts at 30x
+    the cost), and each hit pixel gets a colour from a lookup table
+    ramping from MIN_BRIGHTNESS at one ball to full `color` at
+    SATURATION_HITS. Cost is a few passes over the balls plus one over
+    the count array, and never depends on the radius. The container
+    outline is drawn on top with pygame.draw.polygon.
+
+    The target must be a 32-bit surface (surfarray.pixels2d).
+    """
+
+    def __init__(self, color=POINT_COLOR, outline_color=OUTLINE_COLOR,
+                 outline_width=OUTLINE_WIDTH, saturation=SATURATION_HITS):
+        self.color = color
+        self.outline_color = outline_color
+        self.outline_width = outline_width
+        self.saturation = saturation
+        self._lut = None
+        self._format = None
+
+    def _prepare(self, surface):
+        fmt = (surface.get_bitsize(), surface.get_masks())
+        if self._format != fmt:
+            level = np.arange(self.saturation + 1)
+            scale = MIN_BRIGHTNESS + (1.0 - MIN_BRIGHTNESS) * (level - 1) / max(self.saturation - 1, 1)
+            self._lut = np.array([surface.map_rgb(tuple(int(c * f) for c in self.color))
+                                  for f in scale.tolist()], dtype=np.int64)
+            self._format = fmt
+
+    def draw(self, surface, balls, outline=None):
+        """
+        Plot `balls` onto `surface`, then the outline through `outline`'s
+        vertices (e.g. Hexagon.vertex_list(), or a script's
+        calculate_vertices()) if given.
+        """
+        self._prepare(surface)
+        width, height = surface.get_size()
+        x = balls.x.astype(np.int64)
+        y = balls.y.astype(np.int64)
+        # Negative coordinates wrap to huge unsigned ones, so one test each
+        inside = (x.view(np.uint64) < width) & (y.view(np.uint64) < height)
+        if not inside.all():
+            x, y = x[inside], y[inside]
+        if len(x):
+            flat = y * width + x
+            hits = np.bincount(flat, minlength=width * height)
+            values = self._lut[np.minimum(hits[flat], self.saturation)]
+            pixels = pygame.surfarray.pixels2d(surface)
+            pixels[x, y] = values
+            del pixels
+        if outline is not None:
+            pygame.draw.polygon(surface, self.outline_color, outline, self.outline_width)
+
+
+def draw_points(surface, x, y, color):
+    """Set one pixel per ball at int coordinates `x`, `y` (packed colours)."""
+    width, height = surface.get_size()
+    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    if not inside.any():
+        return
+    colors, which = np.unique(color[inside], return_inverse=True)
+    mapped = np.array([surface.map_rgb(unpack_color(c)) for c in colors.tolist()], dtype=np.int64)
+    pixels = pygame.surfarray.pixels2d(surface)
+    pixels[x[inside], y[inside]] = mapped[which]
+    del pixels                   # Unlocks the surface
+
+
+def draw_circles(surface, balls):
+    """The scripts' way: one pygame.draw.circle per ball."""
+    for x, y, radius, color in zip(balls.x.tolist(), balls.y.tolist(),
+                                   balls.radius.tolist(), balls.color.tolist()):
+        pygame.draw.circle(surface, unpack_color(color), (int(x), int(y)), round(radius))
+
+
+def benchmark(counts=(100, 1000, 10000, 50000), radius=4.0, frames=20, seed=0):
+    """
+    Time draw_circles against SpriteRenderer on worlds of `counts` balls.
+    Returns [(count, circle seconds, blits seconds, identical pixels)].
+    """
+    from hexsim.engine import HEIGHT, WIDTH, World, fill_hexagon
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    renderer = SpriteRenderer()
+    rows = []
+    for count in counts:
+        world = fill_hexagon(World(ball_radius=radius, ball_collisions=False), count, seed=seed)
+        world.balls.color[::3] = 0x64C8FF
+        timings = []
+        for draw in (draw_circles, renderer.draw):
+            screen.fill((0, 0, 0))
+            draw(screen, world.balls)
+            start = time.perf_counter()
+            for _ in range(frames):
+                screen.fill((0, 0, 0))
+                draw(screen, world.balls)
+            timings.append((time.perf_counter() - start) / frames)
+            timings.append(pygame.image.tobytes(screen, "RGB"))
+        rows.append((count, timings[0], timings[2], timings[1] == timings[3]))
+    return rows
+
+
+def benchmark_points(counts=(10000, 100000, 1000000), radii=(0.5, 4.0), frames=10, seed=0):
+    """
+    Time PointCloudRenderer (with the hexagon outline) per frame for each
+    ball count and radius. Returns [(count, radius, seconds)].
+    """
+    from hexsim.engine import HEIGHT, WIDTH, World, fill_hexagon
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    renderer = PointCloudRenderer()
+    rows = []
+    for count in counts:
+        for radius in radii:
+            world = fill_hexagon(World(ball_radius=radius, ball_collisions=False), count, seed=seed)
+            outline = world.hexagon.vertex_list()
+            start = time.perf_counter()
+            for _ in range(frames):
+                screen.fill((0, 0, 0))
+                renderer.draw(screen, world.balls, outline)
+            rows.append((count, radius, (time.perf_counter() - start) / frames))
+    return rows
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if sys.argv[1:] == ["points"]:
+        for count, radius, seconds in benchmark_points():
+            print("%7d balls, radius %.1f: %6.2f ms per frame" % (count, radius, seconds * 1000))
+    else:
+        for count, circles, blits, same in benchmark():
+            print("%6d balls: draw.circle %7.2f ms, blits %6.2f ms (%.1fx)%s" % (
+                count, circles * 1000, blits * 1000, circles / blits,
+                "" if same else "  PIXELS DIFFER"))
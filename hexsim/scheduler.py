@@ -0,0 +1,202 @@
+import os
+import sys
+
+import pygame
+
+from hexsim.scripts import demo_objects, load_script
+
+# ----- Configuration Constants -----
+FPS = 60
+IDLE_FPS = 10                    # Frame rate once nothing on screen moves
+IDLE_FRAMES = 30                 # Unchanged frames before dropping to IDLE_FPS
+DEMO_SCRIPT = "claude3.7-sonnet/claude3.7-sonnet-reasoning(high).py"
+
+_HIDDEN = {pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN}
+_SHOWN = {pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWMAXIMIZED}
+_INPUT = {pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+          pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL}
+
+
+class FrameScheduler:
+    """
+    Decides, frame by frame, whether to simulate, whether to draw and how
+    long to sleep, so that a window nobody is watching costs next to
+    nothing.
+
+    - While paused, `events` blocks in pygame.event.wait() instead of
+      spinning at FPS: the process sleeps until a key, a resize or an
+      expose arrives.
+    - While the window is minimized or hidden, `should_render` says no.
+      Physics keeps running at FPS (`simulate_hidden`), or stops and
+      waits like a pause when that is False.
+    - When the caller's scene key (anything hashable describing what
+      would be drawn, e.g. rounded ball and vertex pixels) stays the same,
+      the frame is not redrawn, and after IDLE_FRAMES such frames the
+      loop ticks at IDLE_FPS until something moves or input arrives.
+      Only drawing slows down: `steps` then hands each pass the
+      FPS / IDLE_FPS physics frames it spans, so the simulation keeps
+      running at FPS.
+
+    Typical loop:
+
+        for event in scheduler.events(): ...
+        for _ in range(scheduler.steps()): step()
+        if scheduler.should_render(scene_key()): draw(); flip()
+        scheduler.tick()
+    """
+
+    def __init__(self, fps=FPS, idle_fps=IDLE_FPS, idle_frames=IDLE_FRAMES,
+                 simulate_hidden=True):
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.idle_frames = idle_frames
+        self.simulate_hidden = simulate_hidden
+        self.clock = pygame.time.Clock()
+        self.paused = False
+        self.visible = True
+        self.dirty = True                # Redraw even if the scene is unchanged
+        self.still = 0                   # Consecutive frames with an unchanged scene
+        self._scene = None
+        self._owed = 1.0                 # Physics frames due on the next pass
+        self.rendered = 0
+        self.skipped = 0
+
+    @property
+    def simulating(self):
+        return not self.paused and (self.visible or self.simulate_hidden)
+
+    @property
+    def idle(self):
+        return self.still >= self.idle_frames
+
+    def steps(self):
+        """Physics frames to run this pass: 0 when not simulating."""
+        if not self.simulating:
+            return 0
+        steps = int(self._owed)
+        self._owed -= steps
+        return steps
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        self.wake()
+
+    def wake(self):
+        """Leave the idle rate and redraw on the next frame."""
+        self.dirty = True
+        self.still = 0
+
+    def events(self):
+        """
+        Pending events. Blocks until at least one arrives when there is
+        nothing to simulate and nothing to redraw.
+        """
+        if not self.simulating and not (self.dirty and self.visible):
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+        else:
+            events = pygame.event.get()
+        for event in events:
+            self._watch(event)
+        return events
+
+    def _watch(self, event):
+        if event.type in _HIDDEN:
+            self.visible = False
+        elif event.type in _SHOWN:
+            self.visible = True
+            self.wake()
+        elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE,
+                            pygame.VIDEORESIZE):
+            self.dirty = True
+        elif event.type in _INPUT:
+            self.wake()
+
+    def should_render(self, scene=None):
+        """
+        True when the frame must be drawn. `scene` is compared with the
+        previous frame's; None means "assume it changed".
+        """
+        if not self.visible:
+            self.skipped += 1
+            return False
+        if scene is None or scene != self._scene:
+            self._scene = scene
+            self.still = 0
+        else:
+            self.still += 1
+            if not self.dirty:
+                self.skipped += 1
+                return False
+        self.dirty = False
+        self.rendered += 1
+        return True
+
+    def tick(self):
+        """Sleep until the next frame is due; returns milliseconds elapsed."""
+        if not self.simulating:
+            # Nothing to pace: the next events() call blocks instead, and
+            # the physics resumes where it stopped rather than catching up
+            self._owed = 1.0
+            return self.clock.tick()
+        rate = self.idle_fps if self.visible and self.idle else self.fps
+        self._owed += self.fps / rate
+        return self.clock.tick(rate)
+
+
+def main(path=DEMO_SCRIPT):
+    """
+    Run a script that guards its main loop (by default Claude 3.7
+    reasoning high, with the same Space/R/Up/Down controls), using that
+    script's Ball and Hexagon classes under a FrameScheduler.
+    """
+    script = load_script(path)
+    screen = pygame.display.set_mode((script.WIDTH, script.HEIGHT))
+    pygame.display.set_caption("%s (idle-aware)" % os.path.basename(script.__file__))
+    scheduler = FrameScheduler(fps=script.FPS)
+    ball, hexagon = demo_objects(script)
+    running = True
+    while running:
+        for event in scheduler.events():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    scheduler.toggle_pause()
+                elif event.key == pygame.K_r:
+                    ball, hexagon = demo_objects(script)
+                elif event.key == pygame.K_UP:
+                    hexagon.rotation_speed += 0.005
+                elif event.key == pygame.K_DOWN:
+                    hexagon.rotation_speed -= 0.005
+
+        for _ in range(scheduler.steps()):
+            ball.update()
+            hexagon.update()
+            if hasattr(hexagon, "check_collision"):
+                hexagon.check_collision(ball)
+            else:
+                script.handle_collision(ball, hexagon)
+
+        # Everything the frame shows, at pixel resolution
+        scene = (int(ball.x), int(ball.y), int(ball.vx * 3), int(ball.vy * 3),
+                 tuple((int(x), int(y)) for x, y in hexagon.vertices),
+                 round(hexagon.rotation_speed, 3), scheduler.paused)
+        if scheduler.should_render(scene):
+            screen.fill(script.BLACK)
+            hexagon.draw(screen)
+            ball.draw(screen)
+            # Claude 3.7 Sonnet (no reasoning) has no text overlay
+            if hasattr(script, "draw_text"):
+                script.draw_text(screen, f"Rotation Speed: {hexagon.rotation_speed:.3f}", 24, script.WIDTH // 2, 10)
+                script.draw_text(screen, "Controls: Space = Pause, R = Reset, Up/Down = Change Speed", 20, script.WIDTH // 2, 40)
+                script.draw_text(screen, f"Ball Velocity: ({ball.vx:.1f}, {ball.vy:.1f})", 20, script.WIDTH // 2, 70)
+            pygame.display.flip()
+        scheduler.tick()
+
+    pygame.quit()
+    print("rendered %d frames, skipped %d" % (scheduler.rendered, scheduler.skipped))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
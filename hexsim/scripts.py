@@ -0,0 +1,70 @@
+import importlib.util
+import os
+
+# ----- Configuration Constants -----
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# How the scripts hexsim can drive start their ball: (x, y, vx, vy) from
+# the window size. The hexagon always starts at the window's center.
+DEMO_STARTS = {
+    "claude3.7-sonnet-reasoning(high).py": lambda w, h: (w // 2, h // 3, 2, -2),
+    "claude3.7-sonnet.py": lambda w, h: (w / 2, h / 2, 5, -8),
+}
+
+
+def script_paths(root=REPO_ROOT):
+    """Every model script in the top-level model folders, sorted."""
+    paths = []
+    for folder in sorted(os.listdir(root)):
+        directory = os.path.join(root, folder)
+        if folder.startswith((".", "_")) or folder == "hexsim" or not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                paths.append(os.path.join(directory, name))
+    return paths
+
+
+def resolve(path):
+    """Accept a path relative to the repository root, or a bare script name."""
+    if os.path.exists(path):
+        return os.path.abspath(path)
+    candidate = os.path.join(REPO_ROOT, path)
+    if os.path.exists(candidate):
+        return candidate
+    for script in script_paths():
+        if os.path.basename(script) in (path, path + ".py"):
+            return script
+    raise FileNotFoundError("no model script %r" % path)
+
+
+def load_script(path):
+    """
+    Import a model script as a module without running its main loop, so
+    its Ball/Hexagon classes and constants can be reused.
+
+    Only scripts that start their loop under `if __name__ == "__main__"`
+    can be loaded this way; the others run it at import time. Other
+    module-level code such as pygame.init() always runs.
+    """
+    path = resolve(path)
+    name = "hexsim_script_" + "".join(ch if ch.isalnum() else "_"
+                                      for ch in os.path.splitext(os.path.basename(path))[0])
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def demo_objects(script):
+    """
+    A fresh (ball, hexagon) from a loaded script's own classes, placed and
+    launched as that script's main loop does (see DEMO_STARTS).
+    """
+    name = os.path.basename(script.__file__)
+    if name not in DEMO_STARTS:
+        raise ValueError("no demo start known for %r" % name)
+    x, y, vx, vy = DEMO_STARTS[name](script.WIDTH, script.HEIGHT)
+    ball = script.Ball(x, y)
+    ball.vx, ball.vy = vx, vy
+    return ball, script.Hexagon(script.WIDTH // 2, script.HEIGHT // 2)
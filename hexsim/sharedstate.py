@@ -0,0 +1,199 @@
+import sys
+import time
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from hexsim.engine import World, fill_hexagon
+
+# ----- Shared memory layout -----
+# A 64-byte header of int64/float64 slots, then ball_pos and ball_vel as
+# (capacity, 2) float64 arrays, the row layout the scripts use for one
+# ball (np.array([x, y])).
+MAGIC = 0x31455441_54535848      # b"HXSTATE1", little-endian
+HEADER_BYTES = 64
+GENERATION, FRAME, COUNT, CAPACITY, MAGIC_SLOT = range(5)
+ANGLE_SLOT = 5
+
+Snapshot = namedtuple("Snapshot", "frame angle ball_pos ball_vel")
+
+
+def _map(buf, capacity):
+    header = np.ndarray(HEADER_BYTES // 8, dtype=np.int64, buffer=buf)
+    floats = np.ndarray(HEADER_BYTES // 8, dtype=np.float64, buffer=buf)
+    pos = np.ndarray((capacity, 2), dtype=np.float64, buffer=buf, offset=HEADER_BYTES)
+    vel = np.ndarray((capacity, 2), dtype=np.float64, buffer=buf,
+                     offset=HEADER_BYTES + capacity * 16)
+    return header, floats, pos, vel
+
+
+def _attach(name):
+    """
+    Map an existing block without handing it to this process's resource
+    tracker, which would unlink it when the reader exits: only the
+    publisher owns the block.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class StatePublisher:
+    """
+    Publishes ball state through a named shared-memory block, for analysers
+    in other processes on the same host.
+
+    Consistency uses a seqlock: the generation counter is odd while
+    `publish` is writing and even otherwise, so a reader that sees the
+    same even generation before and after reading knows nothing changed
+    under it. The writer never waits for readers.
+    """
+
+    def __init__(self, capacity, name=None):
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=True, size=HEADER_BYTES + capacity * 32)
+        self.name = self.shm.name
+        self._header, self._floats, self.ball_pos, self.ball_vel = _map(self.shm.buf, capacity)
+        self._header[:] = 0
+        self._header[CAPACITY] = capacity
+        self._header[MAGIC_SLOT] = MAGIC
+
+    def publish(self, frame, angle, x, y, vx, vy):
+        """Write one frame; x, y, vx, vy are equal-length columns."""
+        n = len(x)
+        if n > self.capacity:
+            raise ValueError("%d balls do not fit in capacity %d" % (n, self.capacity))
+        header = self._header
+        header[GENERATION] += 1          # odd: write in progress
+        self.ball_pos[:n, 0] = x
+        self.ball_pos[:n, 1] = y
+        self.ball_vel[:n, 0] = vx
+        self.ball_vel[:n, 1] = vy
+        header[FRAME] = frame
+        header[COUNT] = n
+        self._floats[ANGLE_SLOT] = angle
+        header[GENERATION] += 1          # even: consistent again
+
+    def publish_world(self, world):
+        balls = world.balls
+        self.publish(world.frame, world.hexagon.angle,
+                     balls.x, balls.y, balls.vx, balls.vy)
+
+    def close(self):
+        if self.shm is not None:
+            self._header = self._floats = self.ball_pos = self.ball_vel = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StateReader:
+    """
+    Maps a StatePublisher's block by name. `read` returns a copied
+    Snapshot; `apply` runs a function directly on the shared arrays
+    (no copy) and retries it if the publisher wrote meanwhile.
+    """
+
+    def __init__(self, name):
+        self.shm = _attach(name)
+        header = np.ndarray(HEADER_BYTES // 8, dtype=np.int64, buffer=self.shm.buf)
+        if header[MAGIC_SLOT] != MAGIC:
+            raise ValueError("%r is not a hexsim state block" % name)
+        self.capacity = int(header[CAPACITY])
+        self._header, self._floats, self._pos, self._vel = _map(self.shm.buf, self.capacity)
+
+    @property
+    def generation(self):
+        return int(self._header[GENERATION])
+
+    def apply(self, func, retries=1000):
+        """
+        Call func(frame, angle, ball_pos, ball_vel) on views of the live
+        arrays and return its result once a call ran without a concurrent
+        write. `func` must not keep the views.
+        """
+        header = self._header
+        for _ in range(retries):
+            before = header[GENERATION]
+            if before & 1:
+                time.sleep(0)
+                continue
+            n = header[COUNT]
+            result = func(int(header[FRAME]), float(self._floats[ANGLE_SLOT]),
+                          self._pos[:n], self._vel[:n])
+            if header[GENERATION] == before:
+                return result
+        raise RuntimeError("no consistent snapshot after %d tries" % retries)
+
+    def read(self):
+        """A consistent copy of the latest frame."""
+        return self.apply(lambda frame, angle, pos, vel:
+                          Snapshot(frame, angle, pos.copy(), vel.copy()))
+
+    def close(self):
+        if self.shm is not None:
+            self._header = self._floats = self._pos = self._vel = None
+            self.shm.close()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def benchmark(count=100000, steps=30, seed=0):
+    """
+    Step a `count`-ball world, publishing every frame, and return the mean
+    (step, publish, read) seconds.
+    """
+    world = fill_hexagon(World(ball_radius=0.25, gravity=0.0), count, seed=seed)
+    step = publish = read = 0.0
+    with StatePublisher(count) as publisher, StateReader(publisher.name) as reader:
+        for _ in range(steps):
+            t0 = time.perf_counter()
+            world.step()
+            t1 = time.perf_counter()
+            publisher.publish_world(world)
+            t2 = time.perf_counter()
+            reader.read()
+            t3 = time.perf_counter()
+            step += t1 - t0
+            publish += t2 - t1
+            read += t3 - t2
+    return step / steps, publish / steps, read / steps
+
+
+def watch(name, interval=1.0):
+    """Print the frame and mean speed of a published world every `interval` s."""
+    def mean_speed(frame, angle, pos, vel):
+        return frame, float(np.hypot(vel[:, 0], vel[:, 1]).mean()) if len(vel) else 0.0
+
+    with StateReader(name) as reader:
+        while True:
+            frame, speed = reader.apply(mean_speed)
+            print("frame %d: mean speed %.3f px/frame" % (frame, speed), flush=True)
+            time.sleep(interval)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        watch(sys.argv[1])
+    else:
+        step, publish, read = benchmark()
+        print("100000 balls: step %.1f ms, publish %.2f ms, copy-out read %.2f ms"
+              % (step * 1000, publish * 1000, read * 1000))
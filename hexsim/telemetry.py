@@ -0,0 +1,293 @@
+import argparse
+import asyncio
+import os
+import queue
+import socket
+import struct
+import threading
+
+import numpy as np
+
+# ----- Configuration Constants -----
+QUEUE_SIZE = 4                   # Frames buffered per subscriber before dropping
+ENV_VAR = "HEXSIM_TELEMETRY"     # "host:port" or "unix:/path" opts a run in
+CONTROLS = ("rotation_speed", "gravity", "friction")
+
+# Frame: magic, frame number, hexagon angle, ball count, then one
+# little-endian float32 row (x, y, vx, vy) per ball
+FRAME_MAGIC = b"HXTF"
+FRAME_HEADER = struct.Struct("<4sIdI")
+
+
+def encode_frame(frame, angle, x, y, vx, vy):
+    """One binary state frame; x, y, vx, vy are floats or equal-length arrays."""
+    rows = np.column_stack((np.atleast_1d(x), np.atleast_1d(y),
+                            np.atleast_1d(vx), np.atleast_1d(vy))).astype("<f4")
+    return FRAME_HEADER.pack(FRAME_MAGIC, frame & 0xFFFFFFFF, angle, len(rows)) + rows.tobytes()
+
+
+def decode_frame(data):
+    """(frame, angle, rows) from encode_frame's bytes; rows is (count, 4)."""
+    magic, frame, angle, count = FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC:
+        raise ValueError("not a telemetry frame")
+    rows = np.frombuffer(data, dtype="<f4", count=count * 4, offset=FRAME_HEADER.size)
+    return frame, angle, rows.reshape(count, 4)
+
+
+def parse_address(text):
+    """'host:port', ':port' or 'unix:/path' to (host, port) or a path."""
+    if text.startswith("unix:"):
+        return text[5:]
+    host, _, port = text.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+class _Subscriber:
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, size):
+        self.queue = asyncio.Queue(size)
+        self.dropped = 0
+
+
+class TelemetryServer:
+    """
+    Streams state frames to any number of local subscribers and takes
+    live control messages, from an asyncio loop on a daemon thread.
+
+    The simulation thread calls `publish` once per frame; when nobody is
+    connected it returns before encoding anything. Each subscriber has a
+    queue of QUEUE_SIZE frames: a slow reader loses the oldest frames
+    (counted in `dropped`) instead of slowing the simulation or the other
+    readers down.
+
+    Subscribers may send text lines "name value", with name one of
+    CONTROLS, e.g. "gravity 0.25". `controls` hands the accepted ones to
+    the simulation thread, which applies them between frames.
+
+    `address` is (host, port) for TCP, port 0 picking a free one, or a
+    filesystem path for a Unix socket.
+    """
+
+    def __init__(self, address=("127.0.0.1", 0), queue_size=QUEUE_SIZE):
+        self.address = address
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.rejected = 0
+        self._controls = queue.SimpleQueue()
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @classmethod
+    def from_env(cls):
+        """A started server if ENV_VAR is set, else None."""
+        text = os.environ.get(ENV_VAR)
+        if not text:
+            return None
+        return cls(parse_address(text)).start()
+
+    def start(self):
+        ready = threading.Event()
+        errors = []
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._server = self._loop.run_until_complete(self._listen())
+            except OSError as exc:
+                errors.append(exc)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._shutdown())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name="hexsim-telemetry", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    async def _listen(self):
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            server = await asyncio.start_unix_server(self._serve_client, self.address)
+        else:
+            server = await asyncio.start_server(self._serve_client, *self.address)
+            # Report the real port when 0 was asked for
+            self.address = server.sockets[0].getsockname()[:2]
+        return server
+
+    async def _shutdown(self):
+        self._server.close()
+        await self._server.wait_closed()
+        tasks = [t for t in asyncio.all_tasks(self._loop) if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def close(self):
+        if self._loop is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def _serve_client(self, reader, writer):
+        subscriber = _Subscriber(self.queue_size)
+        self.subscribers.add(subscriber)
+        sender = asyncio.ensure_future(self._send(subscriber, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._control(line)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            sender.cancel()
+            writer.close()
+
+    async def _send(self, subscriber, writer):
+        try:
+            while True:
+                data = await subscriber.queue.get()
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+    def _control(self, line):
+        try:
+            name, value = line.decode("ascii").split()
+            value = float(value)
+        except (UnicodeDecodeError, ValueError):
+            self.rejected += 1
+            return
+        if name not in CONTROLS:
+            self.rejected += 1
+            return
+        self._controls.put((name, value))
+
+    def _broadcast(self, data):
+        for subscriber in self.subscribers:
+            q = subscriber.queue
+            if q.full():
+                q.get_nowait()
+                subscriber.dropped += 1
+            q.put_nowait(data)
+
+    def publish(self, frame, angle, x, y, vx, vy):
+        """Queue one state frame for every subscriber (called per frame)."""
+        if not self.subscribers:
+            return
+        data = encode_frame(frame, angle, x, y, vx, vy)
+        self._loop.call_soon_threadsafe(self._broadcast, data)
+
+    def controls(self):
+        """Control messages received since the last call, as (name, value)."""
+        pending = []
+        while True:
+            try:
+                pending.append(self._controls.get_nowait())
+            except queue.Empty:
+                return pending
+
+
+class TelemetryClient:
+    """Blocking subscriber, for scripts and monitoring tools."""
+
+    def __init__(self, address):
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.connect(address)
+        self._file = self.sock.makefile("rb")
+
+    def read(self):
+        """Next (frame, angle, rows), or None once the server is gone."""
+        header = self._file.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            return None
+        count = FRAME_HEADER.unpack(header)[3]
+        return decode_frame(header + self._file.read(count * 16))
+
+    def set(self, name, value):
+        self.sock.sendall(("%s %r\n" % (name, float(value))).encode("ascii"))
+
+    def close(self):
+        self._file.close()
+        self.sock.close()
+
+
+def run(path, server, headless=False, frames=None):
+    """
+    Run one of the Claude 3.7 scripts with its physics driven by telemetry
+    controls instead of the keyboard, publishing every frame.
+    """
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    from hexsim.scripts import demo_objects, load_script
+    import pygame
+
+    script = load_script(path)
+    ball, hexagon = demo_objects(script)
+    screen = None if headless else pygame.display.set_mode((script.WIDTH, script.HEIGHT))
+    clock = pygame.time.Clock()
+
+    frame = 0
+    running = True
+    while running and (frames is None or frame < frames):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        for name, value in server.controls():
+            if name == "rotation_speed":
+                hexagon.rotation_speed = value
+            else:
+                # Ball.update reads the script's module-level constants
+                setattr(script, name.upper(), value)
+
+        ball.update()
+        hexagon.update()
+        if hasattr(hexagon, "check_collision"):
+            hexagon.check_collision(ball)
+        else:
+            script.handle_collision(ball, hexagon)
+        server.publish(frame, hexagon.angle, ball.x, ball.y, ball.vx, ball.vy)
+        frame += 1
+
+        if screen is not None:
+            screen.fill(script.BLACK)
+            hexagon.draw(screen)
+            ball.draw(screen)
+            pygame.display.flip()
+        clock.tick(script.FPS)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a Claude 3.7 run over telemetry.")
+    parser.add_argument("script", nargs="?", default="claude3.7-sonnet/claude3.7-sonnet-reasoning(high).py")
+    parser.add_argument("--address", default=os.environ.get(ENV_VAR, "127.0.0.1:0"),
+                        help="host:port or unix:/path (default: %s or a free port)" % ENV_VAR)
+    parser.add_argument("--headless", action="store_true", help="no window")
+    parser.add_argument("--frames", type=int, help="stop after this many frames")
+    args = parser.parse_args()
+    with TelemetryServer(parse_address(args.address)).start() as server:
+        print("telemetry on %s" % (server.address,), flush=True)
+        run(args.script, server, args.headless, args.frames)
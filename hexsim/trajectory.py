@@ -0,0 +1,201 @@
+import os
+import struct
+
+import numpy as np
+
+# ----- Configuration Constants -----
+GRAVITY = 0.5
+FRICTION = 0.98                  # Claude 3.7 reasoning (high)'s value
+DEMO_SCRIPT = "claude3.7-sonnet/claude3.7-sonnet-reasoning(high).py"
+
+
+# ----- Frame integrators -----
+# The per-frame free flight of the scripts, operation for operation, so
+# replaying it reproduces their floats bit for bit.
+
+def gravity_move_friction(x, y, vx, vy, gravity, friction):
+    """Ball.update of Claude 3.7 reasoning (high) and Claude 3.5 Sonnet."""
+    vy += gravity
+    x += vx
+    y += vy
+    return x, y, vx * friction, vy * friction
+
+
+def gravity_friction_move(x, y, vx, vy, gravity, friction):
+    """Ball.update of Claude 3.7 Sonnet and reasoning (low)."""
+    vy += gravity
+    vx *= friction
+    vy *= friction
+    return x + vx, y + vy, vx, vy
+
+
+INTEGRATORS = [gravity_move_friction, gravity_friction_move]
+
+# ----- File format -----
+# Little-endian header, then one contiguous block per EVENT_COLUMNS entry.
+# The `frame` block comes first and doubles as the event index: seeking
+# reads it, binary-searches it, then reads a single row of the others.
+MAGIC = b"HXTR"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQdddddd")
+# Contact points are for analysis only, so float32 is plenty for them;
+# everything replay depends on stays float64.
+EVENT_COLUMNS = (("frame", "<u4"), ("edge", "<i1"),
+                 ("pre_vx", "<f8"), ("pre_vy", "<f8"),
+                 ("post_vx", "<f8"), ("post_vy", "<f8"),
+                 ("contact_x", "<f4"), ("contact_y", "<f4"),
+                 ("x", "<f8"), ("y", "<f8"))
+DENSE_BYTES_PER_FRAME = 4 * 8    # x, y, vx, vy as float64
+
+
+class TrajectoryRecorder:
+    """
+    Records a single-ball run as its initial state plus the frames where
+    something other than free flight happened.
+
+    Call `observe` once per frame with the ball's state after the frame.
+    The recorder replays the integrator from the previous state; when the
+    result differs from what it is given (a wall changed it), it stores
+    an impact: frame, edge, velocity before and after, contact point and
+    the position after any push-out.
+    """
+
+    def __init__(self, x, y, vx, vy, gravity=GRAVITY, friction=FRICTION,
+                 integrator=gravity_move_friction):
+        self.start = (x, y, vx, vy)
+        self.gravity = gravity
+        self.friction = friction
+        self.integrator = integrator
+        self.frames = 0
+        self._state = self.start
+        self._events = {name: [] for name, _ in EVENT_COLUMNS}
+
+    def observe(self, x, y, vx, vy, edge=-1, contact=(np.nan, np.nan)):
+        self.frames += 1
+        px, py, pvx, pvy = self.integrator(*self._state, self.gravity, self.friction)
+        state = (x, y, vx, vy)
+        self._state = state
+        if (px, py, pvx, pvy) == state:
+            return False
+        row = (self.frames, edge, pvx, pvy, vx, vy, contact[0], contact[1], x, y)
+        for (name, _), value in zip(EVENT_COLUMNS, row):
+            self._events[name].append(value)
+        return True
+
+    def save(self, path):
+        header = HEADER.pack(MAGIC, VERSION, INTEGRATORS.index(self.integrator),
+                             self.frames, len(self._events["frame"]),
+                             self.gravity, self.friction, *self.start)
+        with open(path, "wb") as f:
+            f.write(header)
+            for name, dtype in EVENT_COLUMNS:
+                f.write(np.asarray(self._events[name], dtype=dtype).tobytes())
+
+
+class Trajectory:
+    """
+    A recorded trajectory, read lazily: `state_at` seeks through the
+    frame index and replays at most one inter-impact flight.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            head = f.read(HEADER.size)
+        (magic, version, integrator, self.frames, self.count, self.gravity,
+         self.friction, *start) = HEADER.unpack(head)
+        if magic != MAGIC:
+            raise ValueError("%s: not a hexsim trajectory" % path)
+        if version != VERSION:
+            raise ValueError("%s: unsupported trajectory version %d" % (path, version))
+        self.path = path
+        self.start = tuple(start)
+        self.integrator = INTEGRATORS[integrator]
+        self.columns = {}
+        offset = HEADER.size
+        for name, dtype in EVENT_COLUMNS:
+            self.columns[name] = (np.memmap(path, dtype=dtype, mode="r", offset=offset,
+                                            shape=(self.count,))
+                                  if self.count else np.empty(0, dtype=dtype))
+            offset += self.count * np.dtype(dtype).itemsize
+
+    @property
+    def nbytes(self):
+        return os.path.getsize(self.path)
+
+    def compression_ratio(self):
+        """Size of dense per-frame float64 storage over this file's size."""
+        return self.frames * DENSE_BYTES_PER_FRAME / self.nbytes
+
+    def event(self, k):
+        """Impact k as a dict of its columns."""
+        return {name: column[k].item() for name, column in self.columns.items()}
+
+    def state_at(self, frame):
+        """(x, y, vx, vy) after `frame` frames (0 is the initial state)."""
+        if not 0 <= frame <= self.frames:
+            raise IndexError("frame %d outside 0..%d" % (frame, self.frames))
+        k = int(np.searchsorted(self.columns["frame"], frame, side="right")) - 1
+        if k < 0:
+            state, at = self.start, 0
+        else:
+            c = self.columns
+            state = (c["x"][k].item(), c["y"][k].item(),
+                     c["post_vx"][k].item(), c["post_vy"][k].item())
+            at = int(c["frame"][k])
+        for _ in range(frame - at):
+            state = self.integrator(*state, self.gravity, self.friction)
+        return state
+
+
+def record_script(path, out, frames=3600, constants=None):
+    """
+    Run a script whose Hexagon has `check_collision`/`handle_collision`
+    (Claude 3.7 reasoning high) headless for `frames` frames, with its
+    module constants overridden by `constants`, record it to `out` and
+    return the dense (frames + 1, 4) reference trajectory.
+    """
+    from hexsim.scripts import demo_objects, load_script
+
+    script = load_script(path)
+    for name, value in (constants or {}).items():
+        setattr(script, name, value)
+    ball, hexagon = demo_objects(script)
+    recorder = TrajectoryRecorder(ball.x, ball.y, ball.vx, ball.vy,
+                                  script.GRAVITY, script.FRICTION)
+    hit = {}
+    handle = hexagon.handle_collision
+
+    def handle_collision(ball, p1, p2):
+        hit["edge"] = hexagon.vertices.index(p1)
+        hit["contact"] = hexagon.closest_point_on_line(p1, p2, (ball.x, ball.y))
+        handle(ball, p1, p2)
+
+    hexagon.handle_collision = handle_collision
+    dense = [(ball.x, ball.y, ball.vx, ball.vy)]
+    for _ in range(frames):
+        hit.clear()
+        ball.update()
+        hexagon.update()
+        hexagon.check_collision(ball)
+        recorder.observe(ball.x, ball.y, ball.vx, ball.vy,
+                         hit.get("edge", -1), hit.get("contact", (np.nan, np.nan)))
+        dense.append((ball.x, ball.y, ball.vx, ball.vy))
+    recorder.save(out)
+    return np.array(dense, dtype=np.float64)
+
+
+if __name__ == "__main__":
+    # A lossless ball keeps bouncing for the whole run. With the script's
+    # own losses it comes to rest against a wall within a few seconds, and
+    # then every frame is a contact, which no impact format can compress.
+    out = "hexsim-demo.traj"
+    dense = record_script(DEMO_SCRIPT, out, 36000,
+                          {"FRICTION": 1.0, "RESTITUTION": 1.0})
+    trajectory = Trajectory(out)
+    rebuilt = np.array([trajectory.state_at(f) for f in range(trajectory.frames + 1)])
+    print("%d frames, %d impacts, %d bytes (dense: %d), ratio %.0fx, exact: %s"
+          % (trajectory.frames, trajectory.count, trajectory.nbytes,
+             trajectory.frames * DENSE_BYTES_PER_FRAME,
+             trajectory.compression_ratio(), np.array_equal(rebuilt, dense)))
+    del trajectory
+    os.unlink(out)
@@ -0,0 +1,52 @@
+from hexsim.contact import FREE, SLEEPING, ContactTracker
+from hexsim.engine import World, escaped, fill_hexagon
+from hexsim.hexagon import Hexagon
+
+
+def settled_world(count=300, frames=400, seed=0):
+    """A still hexagon whose pile has partly fallen asleep."""
+    tracker = ContactTracker()
+    hexagon = Hexagon(400, 300, 300, rotation_speed=0.0)
+    world = World(hexagon=hexagon, ball_radius=2.0, contacts=tracker)
+    fill_hexagon(world, count, seed=seed)
+    for _ in range(frames):
+        world.step()
+    return world, tracker
+
+
+def test_pile_falls_asleep():
+    world, tracker = settled_world()
+    free, resting, sleeping = tracker.counts()
+    assert sleeping > 0
+    assert free + resting + sleeping == len(world.balls)
+
+
+def test_replaced_slot_starts_free():
+    world, tracker = settled_world()
+    slot = int(next(i for i, s in enumerate(tracker.state) if s == SLEEPING))
+    world.balls.remove(slot)
+    world.balls.add(400, 100, radius=2.0)
+    world.step()
+    # The last ball moved into `slot`, and the new one is in the air
+    assert tracker.state[slot] == FREE
+    assert tracker.state[-1] == FREE
+    assert len(tracker.state) == len(world.balls)
+
+
+def test_added_ball_falls_instead_of_inheriting_sleep():
+    world, tracker = settled_world()
+    world.balls.remove(0)
+    new = world.balls.add(400, 100, radius=2.0)
+    for _ in range(30):
+        world.step()
+    assert new.y > 200
+
+
+def test_tracked_pile_stays_inside():
+    tracker = ContactTracker()
+    hexagon = Hexagon(400, 300, 200, rotation_speed=0.0)
+    world = fill_hexagon(World(hexagon=hexagon, ball_radius=2.0, contacts=tracker),
+                         1000, seed=1)
+    for _ in range(300):
+        world.step()
+        assert len(escaped(world)) == 0
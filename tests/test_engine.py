@@ -0,0 +1,40 @@
+import numpy as np
+
+from hexsim.engine import World, escaped, fill_hexagon
+
+
+def run(world, frames):
+    """Step `world`, returning the most balls found outside after any frame."""
+    worst = 0
+    for _ in range(frames):
+        world.step()
+        worst = max(worst, len(escaped(world)))
+    return worst
+
+
+def test_pile_stays_inside_under_gravity():
+    world = fill_hexagon(World(ball_radius=2.0), 200, seed=0)
+    assert run(world, 600) == 0
+
+
+def test_dense_pile_stays_inside_with_extra_iterations():
+    world = fill_hexagon(World(ball_radius=2.0, iterations=4), 1500, seed=1)
+    assert run(world, 200) == 0
+
+
+def test_gas_stays_inside():
+    world = fill_hexagon(World(ball_radius=1.0, gravity=0.0), 2000, speed=8.0, seed=2)
+    assert run(world, 200) == 0
+
+
+def test_escaped_reports_a_ball_outside():
+    world = fill_hexagon(World(ball_radius=2.0), 10, seed=3)
+    world.balls.x[4] += 1000.0
+    assert escaped(world).tolist() == [4]
+
+
+def test_ball_pass_conserves_ball_count():
+    world = fill_hexagon(World(ball_radius=2.0), 300, seed=4)
+    run(world, 50)
+    assert len(world.balls) == 300
+    assert np.isfinite(world.balls.x).all() and np.isfinite(world.balls.y).all()
@@ -0,0 +1,30 @@
+import numpy as np
+
+from hexsim.engine import World, escaped, fill_hexagon
+from hexsim.nested import NestedContainers
+
+
+def nested_world(count, seed=0):
+    nest = NestedContainers.regular(400, 300, [80, 160, 260], [0.02, -0.03, 0.01])
+    world = fill_hexagon(World(hexagon=nest, ball_radius=2.0), count, seed=seed)
+    world.step()
+    return world, nest
+
+
+def test_balls_stay_between_their_shells():
+    world, nest = nested_world(1500)
+    start = np.bincount(nest._gaps(world.balls), minlength=4)
+    for _ in range(400):
+        world.step()
+        assert len(escaped(world)) == 0
+    # Nobody crossed a wall into another gap
+    assert np.bincount(nest._gaps(world.balls), minlength=4).tolist() == start.tolist()
+
+
+def test_penetration_sees_a_ball_inside_a_wall():
+    world, nest = nested_world(10, seed=1)
+    lx, ly = nest.shells[1].polygon.vertices[0]
+    c, s = nest.shells[1].rotor.c, nest.shells[1].rotor.s
+    world.balls.x[3] = nest.center_x + lx * c - ly * s
+    world.balls.y[3] = nest.center_y + lx * s + ly * c
+    assert nest.penetration(world.balls)[3] > 1.0
@@ -0,0 +1,47 @@
+import pytest
+
+from hexsim.engine import World, escaped, fill_hexagon
+from hexsim.parallel import ParallelWorld, check_wall_exactness
+
+
+def test_empty_world_has_no_phantom_ball():
+    world = World()
+    with ParallelWorld(world, workers=1) as pworld:
+        assert len(world.balls) == 0
+        pworld.step()
+        assert len(world.balls) == 0
+        assert world.frame == 1
+
+
+def test_balls_added_within_capacity_are_stepped():
+    world = World()
+    with ParallelWorld(world, workers=2, capacity=4) as pworld:
+        ball = world.balls.add(400, 300, 1.0, 0.0)
+        pworld.step()
+        assert len(world.balls) == 1
+        assert ball.x == pytest.approx(401.0)
+        assert ball.y > 300
+
+
+def test_adding_past_capacity_raises():
+    world = fill_hexagon(World(), 3, seed=0)
+    with ParallelWorld(world, workers=1) as pworld:
+        with pytest.raises(ValueError):
+            world.balls.add(400, 300)
+        pworld.step()
+        assert len(world.balls) == 3
+    # After close the World owns its balls again and can grow
+    world.balls.add(400, 300)
+    assert len(world.balls) == 4
+
+
+def test_pile_stays_inside():
+    world = fill_hexagon(World(ball_radius=2.0), 500, seed=1)
+    with ParallelWorld(world, workers=2) as pworld:
+        for _ in range(100):
+            pworld.step()
+            assert len(escaped(world)) == 0
+
+
+def test_walls_are_bit_exact():
+    assert check_wall_exactness(count=2000, steps=10, workers=2)
@@ -0,0 +1,56 @@
+import numpy as np
+
+from hexsim import polygon as polygon_module
+from hexsim.balls import BallSet
+from hexsim.engine import World, escaped, fill_hexagon
+from hexsim.polygon import Container, ConvexPolygon, collide_polygon
+from hexsim.trig import Rotor
+
+
+def lopsided(sides=20, radius=200.0):
+    """A convex polygon with the origin close to one edge."""
+    angles = np.linspace(0, 2 * np.pi, sides, endpoint=False)
+    v = np.column_stack((radius * np.cos(angles), radius * np.sin(angles)))
+    return ConvexPolygon(v - (0.9 * radius, 0.0))
+
+
+def test_reach_is_a_lower_bound_over_each_sector():
+    poly = lopsided()
+    v = poly.vertices
+    nxt = np.roll(v, -1, axis=0)
+    # Sample every edge's sector triangle (origin, v[i], v[i + 1])
+    rng = np.random.default_rng(0)
+    u, w = rng.random((2, 500))
+    flip = u + w > 1
+    u[flip], w[flip] = 1 - u[flip], 1 - w[flip]
+    for k in range(poly.sides):
+        for i in range(poly.sides):
+            p = u[:, None] * v[i] + w[:, None] * nxt[i]
+            j = (i + k) % poly.sides
+            assert poly.signed_distance(p[:, 0], p[:, 1], j).min() >= poly.reach[k] - 1e-9
+
+
+def test_binary_search_matches_linear_scan(monkeypatch):
+    poly = ConvexPolygon.regular(24, 200.0)
+    rotor = Rotor()
+    rotor.reset(0.3)
+    results = []
+    for limit in (polygon_module.LINEAR_EDGE_LIMIT, 1000):
+        monkeypatch.setattr(polygon_module, "LINEAR_EDGE_LIMIT", limit)
+        balls = BallSet()
+        rng = np.random.default_rng(1)
+        r = 200.0 * np.sqrt(rng.random(2000))
+        theta = rng.random(2000) * 2 * np.pi
+        balls.extend(400 + r * np.cos(theta), 300 + r * np.sin(theta),
+                     rng.uniform(-5, 5, 2000), rng.uniform(-5, 5, 2000), 3.0)
+        collide_polygon(balls, None, poly, rotor, 400, 300, 0.01)
+        results.append(np.column_stack((balls.x, balls.y, balls.vx, balls.vy)))
+    assert np.array_equal(results[0], results[1])
+
+
+def test_many_sided_container_keeps_a_pile_inside():
+    container = Container(ConvexPolygon.regular(40, 200.0), 400, 300, rotation_speed=0.02)
+    world = fill_hexagon(World(hexagon=container, ball_radius=2.0), 800, seed=2)
+    for _ in range(300):
+        world.step()
+        assert len(escaped(world)) == 0